@@ -1,15 +1,21 @@
+import os
 import pandas as pd
 import numpy as np
 import pickle
+from joblib import Parallel, delayed
+from sklearn.base import clone
 from sklearn.pipeline import make_pipeline
-from sklearn.model_selection import StratifiedKFold, cross_validate, cross_val_predict
+from sklearn.model_selection import StratifiedKFold
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics import make_scorer, recall_score, confusion_matrix, classification_report
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, confusion_matrix, classification_report
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import LinearSVC
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.ensemble import RandomForestClassifier
 
+# Nombre de processus pour la vectorisation et l'évaluation (-1 = tous les cœurs)
+N_JOBS = int(os.environ.get('TRAIN_N_JOBS', -1))
+
 df = pd.read_csv('./weeb_satisfaction_dataset_partial.csv')
 df = df[['message', 'satisfaction']].dropna()
 df = df.drop_duplicates(subset='message').reset_index(drop=True)
@@ -26,14 +32,42 @@ candidats = {
     'Forêt Aléatoire':       RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42),
 }
 
-recall_insatisfaits = make_scorer(recall_score, pos_label=0)
-scoring = {
-    'accuracy':            'accuracy',
-    'f1':                  'f1',
-    'precision':           'precision',
-    'rappel_insatisfaits': recall_insatisfaits,
-}
 cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+folds = list(cv.split(x, y))
+
+
+# Cache des transformations TF-IDF : chaque fold est vectorisé une seule fois
+# (fit sur le train du fold) puis réutilisé par tous les candidats, la matrice
+# de confusion et l'analyse des seuils.
+def vectoriser_fold(train_idx, test_idx):
+    vectorizer = clone(tfidf).fit(x.iloc[train_idx])
+    return vectorizer.transform(x.iloc[train_idx]), vectorizer.transform(x.iloc[test_idx])
+
+
+def evaluer(clf, x_train, x_test, y_train, y_test):
+    """Entraîne un candidat sur un fold déjà vectorisé ; renvoie scores, prédictions et probas."""
+    model = clone(clf).fit(x_train, y_train)
+    y_pred = model.predict(x_test)
+    proba = model.predict_proba(x_test)[:, 1] if hasattr(model, 'predict_proba') else None
+
+    scores = {
+        'accuracy':            accuracy_score(y_test, y_pred),
+        'f1':                  f1_score(y_test, y_pred),
+        'precision':           precision_score(y_test, y_pred),
+        'rappel_insatisfaits': recall_score(y_test, y_pred, pos_label=0),
+    }
+    return scores, y_pred, proba
+
+
+matrices = Parallel(n_jobs=N_JOBS)(delayed(vectoriser_fold)(train_idx, test_idx) for train_idx, test_idx in folds)
+
+# Tous les couples (candidat, fold) sont évalués en parallèle
+taches = [(nom, fold) for nom in candidats for fold in range(len(folds))]
+resultats = Parallel(n_jobs=N_JOBS)(
+    delayed(evaluer)(candidats[nom], *matrices[fold], y.iloc[folds[fold][0]], y.iloc[folds[fold][1]])
+    for nom, fold in taches
+)
+resultats = dict(zip(taches, resultats))
 
 print("=== Comparaison des modèles (5-fold stratifié) ===\n")
 print(f"{'Modèle':<25} {'Accuracy':>10} {'F1':>10} {'Precision':>10} {'Rappel(0)':>10} {'F1 ± std':>15}")
@@ -42,26 +76,31 @@ print("-" * 85)
 best_name, best_model, best_f1 = None, None, 0
 
 for nom, clf in candidats.items():
-    pipeline = make_pipeline(tfidf, clf)
-    res = cross_validate(pipeline, x, y, cv=cv, scoring=scoring)
+    res = {metric: np.array([resultats[nom, fold][0][metric] for fold in range(len(folds))])
+           for metric in ['accuracy', 'f1', 'precision', 'rappel_insatisfaits']}
 
-    acc  = res['test_accuracy'].mean()
-    f1   = res['test_f1'].mean()
-    f1s  = res['test_f1'].std()
-    prec = res['test_precision'].mean()
-    rec  = res['test_rappel_insatisfaits'].mean()
+    acc  = res['accuracy'].mean()
+    f1   = res['f1'].mean()
+    f1s  = res['f1'].std()
+    prec = res['precision'].mean()
+    rec  = res['rappel_insatisfaits'].mean()
 
     print(f"{nom:<25} {acc*100:>9.1f}% {f1*100:>9.1f}% {prec*100:>9.1f}% {rec*100:>9.1f}% {f1*100:>8.1f}% ± {f1s*100:.1f}%")
 
     if f1 > best_f1:
-        best_f1, best_name, best_model = f1, nom, pipeline
+        best_f1, best_name, best_model = f1, nom, make_pipeline(tfidf, clf)
 
 print(f"\n→ Modèle retenu : {best_name} (F1 moyen : {best_f1*100:.1f}%)")
 
-# Matrice de confusion — Régression Logistique (via cross_val_predict)
+# Prédictions hors-fold de la Régression Logistique, reprises de l'évaluation
+# (équivalent de cross_val_predict, sans ré-entraîner ni re-vectoriser)
+y_pred = np.empty(len(y), dtype=int)
+lr_proba = np.empty(len(y))
+for fold, (_, test_idx) in enumerate(folds):
+    _, y_pred[test_idx], lr_proba[test_idx] = resultats['Régression Logistique', fold]
+
+# Matrice de confusion — Régression Logistique
 print("\n=== Matrice de confusion — Régression Logistique (5-fold CV, 80 exemples) ===")
-lr_pipeline = make_pipeline(tfidf, LogisticRegression(max_iter=200, class_weight='balanced'))
-y_pred = cross_val_predict(lr_pipeline, x, y, cv=cv)
 cm = confusion_matrix(y, y_pred)
 tn, fp, fn, tp = cm.ravel()
 print(f"\n                     Prédit Insatisfait(0)   Prédit Satisfait(1)")
@@ -75,7 +114,6 @@ print(classification_report(y, y_pred, target_names=['Insatisfait (0)', 'Satisfa
 
 # Analyse des seuils de décision — Régression Logistique
 print("\n=== Analyse des seuils — Régression Logistique ===\n")
-lr_proba = cross_val_predict(lr_pipeline, x, y, cv=cv, method='predict_proba')[:, 1]
 print(f"{'Seuil':>6}  {'Accuracy':>9}  {'Rappel(sat)':>11}  {'FP':>4}  {'FN':>4}")
 print("-" * 45)
 for s in [0.3, 0.4, 0.5, 0.6, 0.7]:
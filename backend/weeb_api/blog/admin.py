@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Article, Category
+from .search import search_condition
 
 
 @admin.register(Category)
@@ -14,7 +15,8 @@ class ArticleAdmin(admin.ModelAdmin):
     """Admin for Articles"""
     list_display = ['id', 'title', 'author', 'category', 'created_at']
     list_filter = ['category', 'created_at', 'author']
-    search_fields = ['title', 'content', 'author__email', 'author__first_name', 'author__last_name']
+    # title/content go through the full-text index, see get_search_results
+    search_fields = ['author__email', 'author__first_name', 'author__last_name']
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
     
@@ -23,4 +25,11 @@ class ArticleAdmin(admin.ModelAdmin):
         ('Metadata', {'fields': ('author', 'category', 'created_at')}),
     )
     
-    readonly_fields = ['created_at']
\ No newline at end of file
+    readonly_fields = ['created_at']
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Author fields with icontains, title/content with the full-text index"""
+        by_author, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if not search_term:
+            return by_author, may_have_duplicates
+        return by_author | queryset.filter(search_condition(search_term)), may_have_duplicates
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def repair_search_index(sender, using, **kwargs):
+    from django.db import connections
+    from .search import repair_sqlite_triggers
+    repair_sqlite_triggers(connections[using])
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        from . import cache  # noqa: F401 - connects the invalidation receivers
+        post_migrate.connect(repair_search_index, sender=self)
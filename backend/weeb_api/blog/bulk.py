@@ -0,0 +1,138 @@
+"""
+Bulk article writes behind POST/PATCH /api/articles/bulk/.
+
+A batch costs a fixed number of queries whatever its size: one IN query for
+the categories, one for the articles being updated, one role lookup for the
+permission check, then a single bulk_create/bulk_update inside a transaction.
+Batches are all-or-nothing: every item is checked first and if any fails,
+nothing is written and each item's outcome is reported.
+"""
+from django.db import transaction
+from rest_framework import status
+
+from users.authentication import model_user
+
+from .cache import response_cache
+from .models import Article, Category
+from .permissions import IsOwnerOrModeratorOrAdmin
+from .serializers import ArticleBulkItemSerializer
+
+
+def item_error(index, code, errors):
+    return {'index': index, 'success': False, 'status': code, 'errors': errors}
+
+
+def validate_items(items, partial):
+    """
+    Field validation of every item, then one IN query for all their categories.
+    Returns (results with the errors filled in, {index: validated data}, categories).
+    """
+    results = [None] * len(items)
+    valid = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = item_error(index, status.HTTP_400_BAD_REQUEST, {'non_field_errors': ['Expected an object.']})
+            continue
+        serializer = ArticleBulkItemSerializer(data=item, partial=partial)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            results[index] = item_error(index, status.HTTP_400_BAD_REQUEST, serializer.errors)
+
+    categories = Category.objects.in_bulk({data['category_id'] for data in valid.values() if 'category_id' in data})
+    for index, data in list(valid.items()):
+        if 'category_id' in data and data['category_id'] not in categories:
+            results[index] = item_error(index, status.HTTP_404_NOT_FOUND, {'category_id': ['Cette catégorie n\'existe pas.']})
+            del valid[index]
+    return results, valid, categories
+
+
+def failed_batch(results):
+    """Overall status and per-item results of a batch with at least one failure."""
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = item_error(index, status.HTTP_424_FAILED_DEPENDENCY,
+                                        {'non_field_errors': ['Not saved: another item of the batch failed.']})
+    codes = {result['status'] for result in results if result['status'] != status.HTTP_424_FAILED_DEPENDENCY}
+    return (codes.pop() if len(codes) == 1 else status.HTTP_400_BAD_REQUEST), results
+
+
+def bulk_create_articles(request, items):
+    """Create every item with the current user as author; returns (status, results)."""
+    results, valid, categories = validate_items(items, partial=False)
+    for index, data in list(valid.items()):
+        if 'id' in data:
+            results[index] = item_error(index, status.HTTP_400_BAD_REQUEST, {'id': ['Not allowed when creating.']})
+            del valid[index]
+    if len(valid) < len(items):
+        return failed_batch(results)
+
+    author = model_user(request.user)
+    articles = []
+    for data in valid.values():
+        article = Article(title=data['title'], content=data['content'], author=author,
+                          category=categories[data['category_id']])
+        article.refresh_summary()
+        articles.append(article)
+
+    with transaction.atomic():
+        Article.objects.bulk_create(articles)
+        response_cache.invalidate('articles')  # bulk writes send no post_save
+
+    return status.HTTP_201_CREATED, [
+        {'index': index, 'success': True, 'status': status.HTTP_201_CREATED, 'id': article.id}
+        for index, article in enumerate(articles)
+    ]
+
+
+def bulk_update_articles(request, view, items):
+    """Partially update every item (by id) the user may edit; returns (status, results)."""
+    results, valid, categories = validate_items(items, partial=True)
+    seen = set()
+    for index, data in list(valid.items()):
+        if 'id' not in data:
+            results[index] = item_error(index, status.HTTP_400_BAD_REQUEST, {'id': ['This field is required.']})
+        elif data['id'] in seen:
+            results[index] = item_error(index, status.HTTP_400_BAD_REQUEST, {'id': ['Duplicate article in the batch.']})
+        else:
+            seen.add(data['id'])
+            continue
+        del valid[index]
+
+    with transaction.atomic():
+        # Locked until commit so concurrent single edits are not overwritten
+        articles = Article.objects.select_for_update().in_bulk([data['id'] for data in valid.values()])
+        allowed = {article.pk for article in IsOwnerOrModeratorOrAdmin().allowed_objects(request, view, articles.values())}
+        for index, data in list(valid.items()):
+            if data['id'] not in articles:
+                results[index] = item_error(index, status.HTTP_404_NOT_FOUND, {'id': ['Article not found.']})
+            elif data['id'] not in allowed:
+                results[index] = item_error(index, status.HTTP_403_FORBIDDEN,
+                                            {'detail': ['You do not have permission to edit this article.']})
+            else:
+                continue
+            del valid[index]
+        if len(valid) < len(items):
+            return failed_batch(results)
+
+        fields = set()
+        for data in valid.values():
+            article = articles[data['id']]
+            for name in ['title', 'content']:
+                if name in data:
+                    setattr(article, name, data[name])
+                    fields.add(name)
+            if 'category_id' in data:
+                article.category = categories[data['category_id']]
+                fields.add('category')
+            if 'content' in data:
+                article.refresh_summary()
+                fields.update(['excerpt', 'word_count'])
+        if fields:
+            Article.objects.bulk_update([articles[data['id']] for data in valid.values()], sorted(fields))
+            response_cache.invalidate('articles')  # bulk writes send no post_save
+
+    return status.HTTP_200_OK, [
+        {'index': index, 'success': True, 'status': status.HTTP_200_OK, 'id': data['id']}
+        for index, data in valid.items()
+    ]
@@ -0,0 +1,162 @@
+"""
+Response cache for article and category reads.
+
+Rendered JSON bodies of successful list/retrieve calls are cached under
+path + sorted query string + auth role + the generation of every model the
+response embeds. Saving or deleting an Article, Category or User bumps that
+model's generation once the write commits, so the next read misses and older
+entries simply expire: invalidation never has to enumerate keys.
+
+Entries and generations live in BLOG_RESPONSE_CACHE, a CACHES alias shared by
+every worker (redis, memcached...), so a write is seen by all of them. Unset
+(the default), or naming a per-process cache (locmem), responses are not cached:
+the other workers would keep serving what the write changed.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+from weeb_api.caches import shared_cache
+
+from .models import Article, Category
+
+
+# Saving only these User fields never changes a rendered author
+USER_FIELDS_NOT_RENDERED = {'last_login', 'password'}
+
+NAMESPACES = ('articles', 'categories', 'users')
+
+
+class ResponseCache:
+    def __init__(self, alias, ttl):
+        self.alias = alias
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        """The shared cache named by BLOG_RESPONSE_CACHE; None (caching off) when unset or per-process"""
+        return shared_cache(self.alias)
+
+    def generation(self, cache, namespace):
+        return cache.get_or_set(f'blog:generation:{namespace}', 0, None)
+
+    def make_key(self, cache, request, namespaces):
+        user = request.user
+        if not user.is_authenticated:
+            role = 'anonymous'
+        elif user.is_staff:
+            role = 'staff'
+        else:
+            role = 'authenticated'
+        generations = '.'.join(str(self.generation(cache, ns)) for ns in namespaces)
+        query = '&'.join(sorted(request.GET.urlencode().split('&')))
+        return f'blog:response:{role}:{generations}:{request.path}?{query}'
+
+    def get(self, cache, key):
+        value = cache.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, cache, key, value):
+        cache.set(key, value, self.ttl)
+
+    def invalidate(self, namespace):
+        """
+        Bump ``namespace``'s generation once the current transaction commits:
+        bumped earlier, a concurrent read could still see the old rows and
+        cache them under the new generation.
+        """
+        transaction.on_commit(lambda: self.bump(namespace))
+
+    def bump(self, namespace):
+        cache = self.cache
+        if cache is None:
+            return
+        key = f'blog:generation:{namespace}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        for namespace in NAMESPACES:
+            self.bump(namespace)
+        self.hits = self.misses = 0
+
+
+response_cache = ResponseCache(settings.BLOG_RESPONSE_CACHE, settings.BLOG_RESPONSE_CACHE_TTL)
+
+
+def cached_response(*namespaces):
+    """
+    Cache the rendered body of a read action. ``namespaces`` lists the models
+    the response embeds ('articles', 'categories', 'users').
+    """
+    def decorator(action):
+        @wraps(action)
+        def wrapper(self, request, *args, **kwargs):
+            # Only JSON bodies are cached; the browsable API renders per request
+            cache = response_cache.cache
+            if cache is None or request.accepted_renderer.format != 'json':
+                return action(self, request, *args, **kwargs)
+
+            key = response_cache.make_key(cache, request, namespaces)
+            cached = response_cache.get(cache, key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = action(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response.add_post_render_callback(
+                    lambda rendered: response_cache.set(cache, key, (rendered.content, rendered['Content-Type']))
+                )
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+@receiver([post_save, post_delete], sender=Article)
+def invalidate_articles(sender, **kwargs):
+    response_cache.invalidate('articles')
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_categories(sender, **kwargs):
+    response_cache.invalidate('categories')
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_users(sender, update_fields=None, **kwargs):
+    # update_last_login() on every login saves update_fields={'last_login'}
+    if update_fields and set(update_fields) <= USER_FIELDS_NOT_RENDERED:
+        return
+    response_cache.invalidate('users')
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_user_groups(sender, action, **kwargs):
+    # Authors are rendered with their group names
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        response_cache.invalidate('users')
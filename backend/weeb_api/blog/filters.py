@@ -0,0 +1,56 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+def parse_instant(value):
+    """ISO datetime, or a date meaning midnight of that day; naive values are in TIME_ZONE."""
+    try:
+        instant = parse_datetime(value)
+        if instant is None:
+            day = parse_date(value)
+            instant = datetime.combine(day, time.min) if day else None
+    except ValueError:
+        instant = None
+    if instant is None:
+        return None
+    if timezone.is_naive(instant):
+        instant = timezone.make_aware(instant)
+    return instant
+
+
+class ArticleFilterBackend(BaseFilterBackend):
+    """
+    Server-side filters for GET /api/articles/:
+    - ?category=<id>, ?author=<id>
+    - ?created_after=<date|datetime> (inclusive), ?created_before=<date|datetime> (exclusive)
+
+    Each combination is served by an Article index: (category, created_at, id),
+    (author, created_at, id) or (created_at, id) for the date range alone.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+
+        for name in ['category', 'author']:
+            if params.get(name):
+                try:
+                    queryset = queryset.filter(**{f'{name}_id': int(params[name])})
+                except ValueError:
+                    errors[name] = 'Must be an integer id.'
+
+        for name, lookup in [('created_after', 'created_at__gte'), ('created_before', 'created_at__lt')]:
+            if params.get(name):
+                instant = parse_instant(params[name])
+                if instant is None:
+                    errors[name] = 'Must be an ISO 8601 date or datetime.'
+                else:
+                    queryset = queryset.filter(**{lookup: instant})
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
@@ -0,0 +1,101 @@
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+
+from blog.cache import response_cache
+from blog.models import Article, Category
+from blog.views import BlogViewSet
+from review.benchmarks import percentiles, time_calls
+from review.models import Review
+from review.views import ReviewViewSet
+from users.models import User
+from weeb_api.renderers import orjson
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the serializer read path with the API_FAST_READS path (.values() projection + '
+        'orjson renderer) on GET /api/articles/ and GET /api/review/, on seeded rows rolled back afterwards'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=2000, help='Articles to seed')
+        parser.add_argument('--reviews', type=int, default=2000, help='Reviews to seed')
+        parser.add_argument('--page-size', type=int, default=100, help='Article list page size')
+        parser.add_argument('--repeat', type=int, default=30, help='Requests per path')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options['articles'], options['reviews'])
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, articles, reviews):
+        group, _ = Group.objects.get_or_create(name='Moderators')
+        authors = [
+            User.objects.create_user(email=f'bench{i}@example.com', first_name='Bench', last_name=f'Author {i}',
+                                     password='bench-password', is_active=True)
+            for i in range(20)
+        ]
+        for author in authors[::2]:
+            author.groups.add(group)
+        category = Category.objects.create(name='Bench')
+        body = 'Un article de benchmark avec des accents, des mots et encore des mots. ' * 40
+        batch = []
+        for i in range(articles):
+            article = Article(title=f'Benchmark article {i}', content=body, author=authors[i % 20], category=category)
+            article.refresh_summary()
+            batch.append(article)
+        Article.objects.bulk_create(batch, batch_size=1000)
+        Review.objects.bulk_create([
+            Review(first_name='Bench', last_name=f'Reviewer {i}', email=f'review{i}@example.com',
+                   message='Service très rapide, merci !', predicted_satisfaction=i % 2, model_version='bench')
+            for i in range(reviews)
+        ], batch_size=1000)
+
+    def run(self, options):
+        factory = RequestFactory()
+        endpoints = [
+            ('articles', BlogViewSet.as_view({'get': 'list'}), f"/api/articles/?page_size={options['page_size']}"),
+            ('reviews', ReviewViewSet.as_view({'get': 'list'}), '/api/review/'),
+        ]
+
+        def call(view, url):
+            response = view(factory.get(url, HTTP_ACCEPT='application/json'))
+            response.render()
+            if response.status_code != 200:
+                raise CommandError(f'{url} answered {response.status_code}')
+            return response.content
+
+        self.stdout.write(f"orjson: {'installed' if orjson else 'not installed (stock renderer)'}")
+        self.stdout.write(f"\n{'Endpoint':<12} {'Path':<12} {'p50 µs':>10} {'p95 µs':>10} {'Body kB':>9}")
+        self.stdout.write('-' * 57)
+
+        saved_alias = response_cache.alias
+        response_cache.alias = ''  # measure the views, not the response cache
+        try:
+            for name, view, url in endpoints:
+                bodies, medians = {}, {}
+                for label, fast in [('serializer', False), ('fast', True)]:
+                    with override_settings(API_FAST_READS=fast, ALLOWED_HOSTS=['testserver']):
+                        bodies[label] = call(view, url)
+                        stats = percentiles(time_calls(lambda u: call(view, u), [url], options['repeat']))
+                    medians[label] = stats['p50']
+                    self.stdout.write(
+                        f"{name:<12} {label:<12} {stats['p50']:>10.0f} {stats['p95']:>10.0f} {len(bodies[label]) / 1024:>9.1f}"
+                    )
+                if bodies['fast'] != bodies['serializer']:
+                    raise CommandError(f'{name}: fast path output differs from the serializer path')
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name}: identical bytes, {medians['serializer'] / medians['fast']:.1f}x faster (p50)"
+                ))
+        finally:
+            response_cache.alias = saved_alias
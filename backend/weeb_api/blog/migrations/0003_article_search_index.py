@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from blog.search import install_search_index
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from blog.search import uninstall_search_index
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text index outside the model: a generated tsvector column + GIN index
+    on PostgreSQL, an FTS5 table kept in sync by triggers on SQLite.
+    """
+
+    dependencies = [
+        ('blog', '0002_article_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
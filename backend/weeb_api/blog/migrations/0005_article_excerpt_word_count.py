@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+# Frozen copy of blog.models.summarize as of this migration: later changes to
+# the model code must not change what this migration writes
+EXCERPT_LENGTH = 150
+
+
+def summarize(content):
+    words = content.split()
+    text = ' '.join(words)
+    if len(text) > EXCERPT_LENGTH:
+        text = text[:EXCERPT_LENGTH].rsplit(' ', 1)[0] + '...'
+    return text, len(words)
+
+
+def backfill(apps, schema_editor):
+    Article = apps.get_model('blog', 'Article')
+    batch = []
+    for article in Article.objects.only('id', 'content').iterator(chunk_size=1000):
+        article.excerpt, article.word_count = summarize(article.content)
+        batch.append(article)
+        if len(batch) == 1000:
+            Article.objects.bulk_update(batch, ['excerpt', 'word_count'])
+            batch = []
+    Article.objects.bulk_update(batch, ['excerpt', 'word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_article_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=153),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_article_excerpt_word_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+
+# Frozen copies: the live blog.search may change after this migration
+ARTICLE_TABLE = 'blog_article'
+UNACCENT_CONFIG = 'french_unaccent'
+
+
+def search_column(config):
+    return [
+        'DROP INDEX IF EXISTS blog_article_search_idx',
+        f'ALTER TABLE {ARTICLE_TABLE} DROP COLUMN IF EXISTS search_vector',
+        f"""ALTER TABLE {ARTICLE_TABLE} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('{config}'::regconfig, coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{config}'::regconfig, coalesce(content, '')), 'B')
+        ) STORED""",
+        f'CREATE INDEX blog_article_search_idx ON {ARTICLE_TABLE} USING GIN (search_vector)',
+    ]
+
+
+FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS unaccent',
+    f"""DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{UNACCENT_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {UNACCENT_CONFIG} (COPY = french);
+            ALTER TEXT SEARCH CONFIGURATION {UNACCENT_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+        END IF;
+    END $$""",
+    *search_column(UNACCENT_CONFIG),
+]
+BACKWARD = [
+    *search_column('french'),
+    f'DROP TEXT SEARCH CONFIGURATION IF EXISTS {UNACCENT_CONFIG}',
+]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        # SQLite's FTS5 table already strips diacritics (remove_diacritics 2)
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        with schema_editor.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    """
+    PostgreSQL search ignores accents, as the SQLite index does: the generated
+    tsvector column is rebuilt with a 'french' copy that unaccents words first.
+    """
+
+    dependencies = [
+        ('blog', '0006_article_view_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgresql(FORWARD), run_on_postgresql(BACKWARD)),
+    ]
@@ -1,6 +1,17 @@
 from django.db import models
 from users.models import User
 
+EXCERPT_LENGTH = 150  # teaser shown on the article cards
+
+
+def summarize(content):
+    """(excerpt, word_count) of an article body; the excerpt is cut on a word boundary"""
+    words = content.split()
+    text = ' '.join(words)
+    if len(text) > EXCERPT_LENGTH:
+        text = text[:EXCERPT_LENGTH].rsplit(' ', 1)[0] + '...'
+    return text, len(words)
+
 # Create your models here.
 
 #Category entity
@@ -24,6 +35,9 @@ class Article(models.Model):
     Fields:
         title (str)
         content (str)
+        excerpt (str) - teaser derived from content on save
+        word_count (int) - derived from content on save
+        view_count (int) - flushed in batches by blog.counters
         created_at (datetime)
         user_id (foreign key)
         category_id (foreign key) 
@@ -31,10 +45,40 @@ class Article(models.Model):
     
     title = models.CharField(max_length=255)
     content = models.TextField()
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH + 3, blank=True, editable=False) # lets the list skip content
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    view_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add = True) #add current datetime when create a new article
-    author = models.ForeignKey(User, related_name = 'articles', on_delete= models.CASCADE) #add author field --> foreign key linked to User
-    category = models.ForeignKey(Category, related_name = 'articles', on_delete = models.PROTECT) # add category field --> foreign key link to Category (entity)
+    author = models.ForeignKey(User, related_name = 'articles', on_delete= models.CASCADE, db_index = False) #add author field --> foreign key linked to User (indexed by article_author_created_idx)
+    category = models.ForeignKey(Category, related_name = 'articles', on_delete = models.PROTECT, db_index = False) # add category field --> foreign key link to Category (entity) (indexed by article_category_created_idx)
+    
+    class Meta:
+        indexes = [
+            # Keyset pagination of the article list: ORDER BY created_at DESC, id DESC
+            models.Index(fields=['-created_at', '-id'], name='article_created_id_idx'),
+            # ?category= / ?author= filters, same order; also serve the foreign key lookups
+            models.Index(fields=['category', '-created_at', '-id'], name='article_category_created_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='article_author_created_idx'),
+        ]
     
     def __str__(self):
         return self.title
+    
+    def refresh_summary(self):
+        """Recompute excerpt and word_count from content (bulk_create/bulk_update skip save())"""
+        self.excerpt, self.word_count = summarize(self.content)
+    
+    def save(self, *args, **kwargs):
+        self.refresh_summary()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            # view_count is only written by F() increments (blog.counters): a full save
+            # of an instance loaded before a flush would overwrite the flushed views
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'view_count'
+            ]
+        elif update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt', 'word_count'}
+        super().save(*args, **kwargs)
     
\ No newline at end of file
@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from users.roles import is_moderator_or_admin
+
 
 class IsOwnerOrModeratorOrAdmin(permissions.BasePermission):
     """
@@ -14,16 +16,18 @@ class IsOwnerOrModeratorOrAdmin(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        # Check if user is admin
-        if request.user.is_staff:
-            return True
-        
-        # Check if user is in Moderators group
-        if request.user.groups.filter(name='Moderators').exists():
+        # Check if user is admin or in Moderators group (roles resolved once per request)
+        if is_moderator_or_admin(request.user):
             return True
         
-        # Check if user is the author
-        return obj.author == request.user
+        # Check if user is the author (by id: request.user may be a claims-only user)
+        return obj.author_id == request.user.id
+    
+    def allowed_objects(self, request, view, objs):
+        """has_object_permission over a batch, looking up the user's role once"""
+        if request.method in permissions.SAFE_METHODS or is_moderator_or_admin(request.user):
+            return list(objs)
+        return [obj for obj in objs if obj.author_id == request.user.id]
 
 
 class IsActiveUser(permissions.BasePermission):
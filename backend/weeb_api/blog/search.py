@@ -0,0 +1,186 @@
+"""
+Full-text search over articles (GET /api/articles/?q=...).
+
+The index lives outside the Django model and depends on the database:
+- PostgreSQL: a stored generated ``search_vector`` tsvector column (title
+  weighted above content) with a GIN index, maintained by the database.
+- SQLite: an external-content FTS5 table ``blog_article_fts`` kept in sync by
+  triggers, ranked with bm25.
+Any other backend falls back to ``icontains`` on title and content.
+
+Both indexes match every word of the input, ignoring accents, and never read
+it as query syntax (plainto_tsquery / quoted FTS5 tokens). PostgreSQL also
+stems French words ("articles" finds "article"), SQLite does not.
+"""
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import Expression, RawSQL
+
+from .models import Article
+
+
+# Text search configuration of the generated column (must match migration 0007):
+# 'french' with unaccent applied before stemming
+SEARCH_CONFIG = 'french_unaccent'
+FTS_TABLE = 'blog_article_fts'
+# bm25 column weights for (title, content)
+FTS_WEIGHTS = (10.0, 1.0)
+TSQUERY = 'plainto_tsquery(%s::regconfig, %s)'
+
+ARTICLE_TABLE = Article._meta.db_table
+
+POSTGRES_INSTALL = [
+    'CREATE EXTENSION IF NOT EXISTS unaccent',
+    f"""DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{SEARCH_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = french);
+            ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+        END IF;
+    END $$""",
+    f"""ALTER TABLE {ARTICLE_TABLE} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(content, '')), 'B')
+    ) STORED""",
+    f'CREATE INDEX blog_article_search_idx ON {ARTICLE_TABLE} USING GIN (search_vector)',
+]
+POSTGRES_UNINSTALL = [
+    'DROP INDEX IF EXISTS blog_article_search_idx',
+    f'ALTER TABLE {ARTICLE_TABLE} DROP COLUMN IF EXISTS search_vector',
+    f'DROP TEXT SEARCH CONFIGURATION IF EXISTS {SEARCH_CONFIG}',
+]
+
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {ARTICLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {ARTICLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, content ON {ARTICLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+SQLITE_INSTALL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, content='{ARTICLE_TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    *SQLITE_TRIGGERS,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def _execute(conn, statements):
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_search_index(conn):
+    if conn.vendor == 'postgresql':
+        _execute(conn, POSTGRES_INSTALL)
+    elif conn.vendor == 'sqlite':
+        _execute(conn, SQLITE_INSTALL)
+
+
+def uninstall_search_index(conn):
+    if conn.vendor == 'postgresql':
+        _execute(conn, POSTGRES_UNINSTALL)
+    elif conn.vendor == 'sqlite':
+        _execute(conn, SQLITE_UNINSTALL)
+
+
+def repair_sqlite_triggers(conn):
+    """
+    SQLite migrations that rebuild blog_article (copy, drop, rename) drop its
+    triggers with it; put them back and reindex. Run after every migrate.
+    """
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE name LIKE %s", [f'{FTS_TABLE}%'])
+        objects = cursor.fetchall()
+    if ('table', FTS_TABLE) in objects and sum(kind == 'trigger' for kind, _ in objects) < len(SQLITE_TRIGGERS):
+        _execute(conn, SQLITE_INSTALL)
+
+
+def fts_query(text):
+    """User input as an FTS5 expression: every word must match, no operators."""
+    return ' '.join(f'"{token}"' for token in re.findall(r'\w+', text))
+
+
+class IndexRank(Expression):
+    """
+    Raw rank SQL correlated on the article id. The id goes through the
+    compiler (not a hard-coded blog_article.id), so the expression keeps
+    pointing at the right table when the queryset is nested in a subquery.
+    """
+    output_field = FloatField()
+
+    def __init__(self, sql, params, column='id'):
+        super().__init__()
+        self.sql, self.params, self.column = sql, params, F(column)
+
+    def get_source_expressions(self):
+        return [self.column]
+
+    def set_source_expressions(self, exprs):
+        self.column, = exprs
+
+    def as_sql(self, compiler, connection):
+        column_sql, column_params = compiler.compile(self.column)
+        return self.sql.format(id=column_sql), (*self.params, *column_params)
+
+
+def search_condition(text):
+    """
+    Q restricting Articles to matches for ``text``: an uncorrelated
+    ``id IN (...)`` on the index, usable in any (sub)query.
+    """
+    if connection.vendor == 'postgresql':
+        return Q(pk__in=RawSQL(
+            f'SELECT id FROM {ARTICLE_TABLE} WHERE search_vector @@ {TSQUERY}', (SEARCH_CONFIG, text)
+        ))
+    if connection.vendor == 'sqlite':
+        expression = fts_query(text)
+        if not expression:
+            return Q(pk__in=[])
+        return Q(pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (expression,)))
+    return Q(title__icontains=text) | Q(content__icontains=text)
+
+
+def search_rank(text):
+    """Relevance of each matching article for ``text``, higher is better."""
+    if connection.vendor == 'postgresql':
+        return IndexRank(
+            f'(SELECT ts_rank(ranked.search_vector, {TSQUERY}) FROM {ARTICLE_TABLE} ranked WHERE ranked.id = {{id}})',
+            (SEARCH_CONFIG, text),
+        )
+    if connection.vendor == 'sqlite' and fts_query(text):
+        # bm25 is lower-is-better
+        return IndexRank(
+            f'(SELECT -bm25({FTS_TABLE}, {FTS_WEIGHTS[0]}, {FTS_WEIGHTS[1]}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {{id}})',
+            (fts_query(text),),
+        )
+    return Value(0.0, output_field=FloatField())
+
+
+def search_articles(queryset, text):
+    """
+    Restrict an Article queryset to matches for ``text``, annotated with
+    ``search_rank`` (higher is better) and ordered best first.
+    """
+    return queryset.filter(search_condition(text)).annotate(
+        search_rank=search_rank(text)
+    ).order_by('-search_rank', '-id')
@@ -2,6 +2,8 @@ from rest_framework import serializers
 from .models import Article, Category
 from users.models import User
 from users.serializers import UserSerializer
+from weeb_api.fastpath import DATETIME, Projection
+from .counters import view_counter
 
 # Category Serializer 
 class CategorySerializer(serializers.ModelSerializer):
@@ -16,10 +18,49 @@ class ArticleReadSerializer(serializers.ModelSerializer):
     """_Article Serializer for reading (GET)_"""
     author = UserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
+    view_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Article
-        fields = ['id', 'title', 'content', 'created_at', 'author', 'category']
+        fields = ['id', 'title', 'content', 'excerpt', 'word_count', 'view_count', 'created_at', 'author', 'category']
+    
+    def get_view_count(self, obj):
+        """Stored count plus this process' views not flushed yet"""
+        return obj.view_count + view_counter.pending(obj.pk)
+
+
+#  LIST Serializer 
+class ArticleListSerializer(ArticleReadSerializer):
+    """_Article Serializer for the list: excerpt instead of the full content_"""
+    
+    class Meta(ArticleReadSerializer.Meta):
+        fields = ['id', 'title', 'excerpt', 'word_count', 'view_count', 'created_at', 'author', 'category']
+
+
+# Serializer-free twin of ArticleListSerializer (API_FAST_READS);
+# author groups and pending views are filled per page
+ARTICLE_LIST_PROJECTION = Projection({
+    'id': 'id',
+    'title': 'title',
+    'excerpt': 'excerpt',
+    'word_count': 'word_count',
+    'view_count': 'view_count',
+    'created_at': ('created_at', DATETIME),
+    'author': {
+        'id': 'author__id',
+        'first_name': 'author__first_name',
+        'last_name': 'author__last_name',
+        'email': 'author__email',
+        'is_active': 'author__is_active',
+        'is_staff': 'author__is_staff',
+        'date_joined': ('author__date_joined', DATETIME),
+        'groups': None,
+    },
+    'category': {
+        'id': 'category__id',
+        'name': 'category__name',
+    },
+})
 
 
 #  WRITE Serializer 
@@ -49,3 +90,13 @@ class ArticleWriteSerializer(serializers.ModelSerializer):
         if not value or len(value.strip()) < 10:
             raise serializers.ValidationError('Content must be at least 10 characters long.')
         return value.strip()
+
+
+#  BULK item Serializer 
+class ArticleBulkItemSerializer(ArticleWriteSerializer):
+    """One item of POST/PATCH /api/articles/bulk/: categories are checked for the whole batch at once"""
+    id = serializers.IntegerField(required=False)
+    category_id = serializers.IntegerField(write_only=True)
+    
+    class Meta(ArticleWriteSerializer.Meta):
+        read_only_fields = []
@@ -1,3 +1,6 @@
+import json
+import time
+
 import pytest
 from django.urls import reverse
 from rest_framework import status
@@ -5,10 +8,24 @@ from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from blog.models import Article, Category
+from blog.search import search_articles
 
 User = get_user_model()
 
 
+@pytest.fixture
+def shared_response_cache(monkeypatch, settings, tmp_path):
+    """Response cache in a CACHES alias seen by every worker (file based, unlike locmem)"""
+    from blog.cache import response_cache
+    
+    settings.CACHES = {**settings.CACHES, 'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': str(tmp_path),
+    }}
+    # The cache reads BLOG_RESPONSE_CACHE once, at import
+    monkeypatch.setattr(response_cache, 'alias', 'shared')
+    return response_cache
+
+
 @pytest.mark.django_db
 class TestArticlePermissions:
     """Test article CRUD operations with permissions"""
@@ -231,3 +248,838 @@ class TestArticlePermissions:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['success'] is True
         assert not Article.objects.filter(pk=article.pk).exists()
+
+
+@pytest.mark.django_db
+class TestArticlePagination:
+    """Test keyset pagination of the article list"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.articles_url = reverse('article-list')
+        category = Category.objects.create(name='Tech')
+        author = User.objects.create_user(
+            email='author@example.com',
+            first_name='Author',
+            last_name='User',
+            password='password123',
+            is_active=True
+        )
+        self.articles = [
+            Article.objects.create(title=f'Article {i}', content='Content', author=author, category=category)
+            for i in range(25)
+        ]
+        # Same timestamp on several rows: the id tie-breaker must keep pages stable
+        Article.objects.filter(pk__in=[a.pk for a in self.articles[5:15]]).update(
+            created_at=self.articles[5].created_at
+        )
+    
+    def expected_ids(self):
+        return list(Article.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+    
+    def test_walk_all_pages(self):
+        """Following `next` returns every article once, newest first"""
+        ids, url = [], self.articles_url + '?page_size=10'
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data['success'] is True
+            assert 'count' not in response.data
+            ids += [article['id'] for article in response.data['results']]
+            url = response.data['next']
+        
+        assert ids == self.expected_ids()
+    
+    def test_default_page_size(self):
+        """The first page holds 20 articles and links to the next one"""
+        response = self.client.get(self.articles_url)
+        
+        assert len(response.data['results']) == 20
+        assert response.data['next'] is not None
+    
+    def test_count_on_request(self):
+        """?count=exact and ?count=approximate add the total"""
+        for mode in ['exact', 'approximate']:
+            response = self.client.get(self.articles_url, {'count': mode})
+            assert response.data['count'] == 25
+    
+    def test_invalid_cursor(self):
+        """A tampered cursor is a 404, not a server error"""
+        response = self.client.get(self.articles_url, {'cursor': 'not-a-cursor'})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    @pytest.mark.parametrize('position', [['2025-13-45T99:00:00', 1], ['2025-01-01T00:00:00', 10 ** 400], [1e400, 1]])
+    def test_well_formed_cursor_with_bad_values(self, position):
+        """A decodable cursor carrying an impossible datetime or id is a 404 too"""
+        from weeb_api.pagination import KeysetPagination
+        
+        token = KeysetPagination().encode_cursor(position)
+        response = self.client.get(self.articles_url, {'cursor': token})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestArticleSearch:
+    """Test full-text search on the article list (?q=)"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.articles_url = reverse('article-list')
+        self.category = Category.objects.create(name='Tech')
+        self.author = User.objects.create_user(
+            email='author@example.com',
+            first_name='Author',
+            last_name='User',
+            password='password123',
+            is_active=True
+        )
+        self.in_title = self.create('Les meilleurs animes de Python', 'Une liste commentée.')
+        self.in_content = self.create('Un article', 'On y parle un peu de Python et de Django.')
+        self.accented = self.create('Le café des otakus', 'Un lieu de rencontre.')
+        self.unrelated = self.create('Manga de la semaine', 'Rien à voir.')
+    
+    def create(self, title, content):
+        return Article.objects.create(title=title, content=content, author=self.author, category=self.category)
+    
+    def search(self, q, **params):
+        response = self.client.get(self.articles_url, {'q': q, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return response
+    
+    def test_ranked_results(self):
+        """Matches only, a title match ranking above a content match"""
+        response = self.search('python')
+        
+        assert response.data['success'] is True
+        assert response.data['count'] == 2
+        assert [a['id'] for a in response.data['results']] == [self.in_title.id, self.in_content.id]
+    
+    def test_all_words_must_match(self):
+        response = self.search('python django')
+        
+        assert [a['id'] for a in response.data['results']] == [self.in_content.id]
+    
+    def test_accents_ignored(self):
+        response = self.search('cafe')
+        
+        assert [a['id'] for a in response.data['results']] == [self.accented.id]
+    
+    def test_index_follows_writes(self):
+        """Updates and deletes are reflected in the index"""
+        self.unrelated.title = 'Python pour les mangakas'
+        self.unrelated.save()
+        self.in_title.delete()
+        
+        response = self.search('python')
+        
+        assert {a['id'] for a in response.data['results']} == {self.unrelated.id, self.in_content.id}
+    
+    def test_pagination(self):
+        response = self.search('python', page_size=1)
+        
+        assert response.data['count'] == 2
+        assert len(response.data['results']) == 1
+        assert response.data['next'] is not None
+    
+    def test_query_syntax_is_not_an_error(self):
+        """FTS operators in user input are treated as plain words"""
+        assert self.search('"python (').data['count'] == 2
+        assert self.search('***').data['count'] == 0
+    
+    def test_operators_are_plain_words(self):
+        """Same results on every backend: no exclusion, no OR"""
+        assert [a['id'] for a in self.search('python -django').data['results']] == [self.in_content.id]
+        assert self.search('python or manga').data['count'] == 0
+    
+    def test_admin_search(self):
+        """The admin search uses the index for title/content and icontains for authors"""
+        from django.contrib.admin.sites import site
+        
+        admin = site._registry[Article]
+        queryset, _ = admin.get_search_results(None, Article.objects.all(), 'python')
+        assert set(queryset) == {self.in_title, self.in_content}
+        
+        queryset, _ = admin.get_search_results(None, Article.objects.all(), 'author@example')
+        assert queryset.count() == 4
+    
+    def test_search_nested_in_a_subquery(self):
+        """The index lookup stays uncorrelated and the rank follows the subquery's alias"""
+        from django.db import connection
+        
+        nested = Article.objects.filter(pk__in=search_articles(Article.objects.all(), 'python').values('pk'))
+        assert set(nested) == {self.in_title, self.in_content}
+        
+        from django.contrib.admin.sites import site
+        queryset, _ = site._registry[Article].get_search_results(None, Article.objects.all(), 'python')
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' | '.join(row[-1] for row in cursor.fetchall())
+        assert 'CORRELATED' not in plan
+        assert 'VIRTUAL TABLE INDEX' in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_response_cache')
+class TestResponseCache:
+    """Test the article/category response cache and its invalidation"""
+    
+    def setup_method(self):
+        from blog.cache import response_cache
+        
+        self.cache = response_cache
+        self.cache.clear()
+        self.client = APIClient()
+        self.articles_url = reverse('article-list')
+        self.category = Category.objects.create(name='Tech')
+        self.author = User.objects.create_user(
+            email='author@example.com',
+            first_name='Author',
+            last_name='User',
+            password='password123',
+            is_active=True
+        )
+        self.article = Article.objects.create(
+            title='Cached Article', content='Some content', author=self.author, category=self.category
+        )
+        self.detail_url = reverse('article-detail', kwargs={'pk': self.article.pk})
+    
+    def test_second_read_is_a_hit(self):
+        first = self.client.get(self.detail_url)
+        second = self.client.get(self.detail_url)
+        
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+        assert self.cache.stats()['hits'] == 1
+        assert self.cache.stats()['misses'] == 1
+    
+    def test_query_order_does_not_matter(self):
+        self.client.get(self.articles_url, {'page_size': 5, 'count': 'exact'})
+        response = self.client.get(self.articles_url + '?count=exact&page_size=5')
+        
+        assert response['X-Cache'] == 'HIT'
+    
+    def test_roles_cached_separately(self):
+        self.client.get(self.detail_url)
+        self.client.force_authenticate(user=self.author)
+        
+        assert self.client.get(self.detail_url)['X-Cache'] == 'MISS'
+    
+    def test_article_write_invalidates(self, django_capture_on_commit_callbacks):
+        self.client.get(self.articles_url)
+        self.article.title = 'Renamed Article'
+        with django_capture_on_commit_callbacks(execute=True):
+            self.article.save()
+        
+        response = self.client.get(self.articles_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['title'] == 'Renamed Article'
+    
+    def test_category_and_author_writes_invalidate(self, django_capture_on_commit_callbacks):
+        self.client.get(self.detail_url)
+        self.category.name = 'Anime'
+        with django_capture_on_commit_callbacks(execute=True):
+            self.category.save()
+        assert self.client.get(self.detail_url).json()['results']['category']['name'] == 'Anime'
+        
+        moderators, _ = Group.objects.get_or_create(name='Moderators')
+        with django_capture_on_commit_callbacks(execute=True):
+            self.author.groups.add(moderators)
+        assert self.client.get(self.detail_url).json()['results']['author']['groups'] == ['Moderators']
+    
+    def test_login_does_not_invalidate(self):
+        """update_last_login only touches last_login, which is never rendered"""
+        from django.contrib.auth.models import update_last_login
+        
+        self.client.get(self.detail_url)
+        update_last_login(None, self.author)
+        
+        assert self.client.get(self.detail_url)['X-Cache'] == 'HIT'
+    
+    def test_category_list_cached(self, django_capture_on_commit_callbacks):
+        self.client.get(reverse('category-list'))
+        assert self.client.get(reverse('category-list'))['X-Cache'] == 'HIT'
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            Category.objects.create(name='Manga')
+        response = self.client.get(reverse('category-list'))
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 2
+    
+    def test_errors_not_cached(self):
+        url = reverse('article-detail', kwargs={'pk': 999999})
+        self.client.get(url)
+        
+        assert self.client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        assert self.cache.stats()['hits'] == 0
+    
+    def test_invalidated_on_commit(self, django_capture_on_commit_callbacks):
+        """Bumped before the commit, a concurrent read could cache the old rows under the new generation"""
+        self.client.get(self.detail_url)
+        self.article.title = 'Renamed Article'
+        with django_capture_on_commit_callbacks() as callbacks:
+            self.article.save()
+            assert self.client.get(self.detail_url)['X-Cache'] == 'HIT'
+        
+        for callback in callbacks:
+            callback()
+        response = self.client.get(self.detail_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results']['title'] == 'Renamed Article'
+    
+    @pytest.mark.parametrize('alias', ['', 'default'])
+    def test_off_unless_cache_shared(self, monkeypatch, alias):
+        """Unset or per-process (locmem): other workers would never see the invalidation"""
+        monkeypatch.setattr(self.cache, 'alias', alias)
+        self.client.get(self.detail_url)
+        response = self.client.get(self.detail_url)
+        
+        assert 'X-Cache' not in response
+        assert self.cache.stats()['hits'] == 0
+
+
+@pytest.mark.django_db
+class TestArticleListQueries:
+    """Test that listing articles costs a constant number of queries"""
+    
+    def setup_method(self):
+        from blog.cache import response_cache
+        
+        response_cache.clear()
+        self.client = APIClient()
+        self.articles_url = reverse('article-list')
+        self.category = Category.objects.create(name='Tech')
+        self.moderators, _ = Group.objects.get_or_create(name='Moderators')
+    
+    def create_articles(self, count):
+        for i in range(count):
+            author = User.objects.create_user(
+                email=f'author{Article.objects.count()}@example.com',
+                first_name='Author',
+                last_name='User',
+                password='password123',
+                is_active=True
+            )
+            author.groups.add(self.moderators)
+            Article.objects.create(title=f'Article {i}', content='Content', author=author, category=self.category)
+    
+    def test_list_query_count_is_constant(self, django_assert_num_queries):
+        """Articles (with author and category) + one prefetch of all authors' groups"""
+        for count in [3, 15]:
+            self.create_articles(count)
+            with django_assert_num_queries(2):
+                response = self.client.get(self.articles_url, {'page_size': 50})
+            assert all(a['author']['groups'] == ['Moderators'] for a in response.data['results'])
+
+
+@pytest.mark.django_db
+class TestArticleFilters:
+    """Test server-side article filters and the indexes behind them"""
+    
+    def setup_method(self):
+        from datetime import datetime, timezone
+        
+        self.client = APIClient()
+        self.articles_url = reverse('article-list')
+        self.tech = Category.objects.create(name='Tech')
+        self.anime = Category.objects.create(name='Anime')
+        self.alice = User.objects.create_user(
+            email='alice@example.com', first_name='Alice', last_name='User', password='password123', is_active=True
+        )
+        self.bob = User.objects.create_user(
+            email='bob@example.com', first_name='Bob', last_name='User', password='password123', is_active=True
+        )
+        self.articles = {}
+        for day, author, category in [(1, self.alice, self.tech), (10, self.bob, self.tech), (20, self.alice, self.anime)]:
+            article = Article.objects.create(title=f'Day {day}', content='Content', author=author, category=category)
+            article.created_at = datetime(2025, 1, day, 12, tzinfo=timezone.utc)
+            article.save()
+            self.articles[day] = article
+    
+    def ids(self, **params):
+        response = self.client.get(self.articles_url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [a['id'] for a in response.data['results']]
+    
+    def test_filter_by_category(self):
+        assert self.ids(category=self.tech.id) == [self.articles[10].id, self.articles[1].id]
+    
+    def test_filter_by_author(self):
+        assert self.ids(author=self.alice.id) == [self.articles[20].id, self.articles[1].id]
+    
+    def test_filter_by_date_range(self):
+        """created_after is inclusive, created_before exclusive; dates mean midnight"""
+        assert self.ids(created_after='2025-01-10T12:00:00Z') == [self.articles[20].id, self.articles[10].id]
+        assert self.ids(created_after='2025-01-05', created_before='2025-01-20') == [self.articles[10].id]
+    
+    def test_filters_combine(self):
+        assert self.ids(author=self.alice.id, category=self.anime.id, created_after='2025-01-15') == [self.articles[20].id]
+    
+    def test_invalid_values(self):
+        response = self.client.get(self.articles_url, {'category': 'tech', 'created_before': 'yesterday'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) == {'category', 'created_before'}
+    
+    def query_plan(self, **params):
+        """EXPLAIN QUERY PLAN of the article query the list endpoint actually runs"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.articles_url, params)
+        sql = next(q['sql'] for q in queries if q['sql'].startswith('SELECT') and '"blog_article"' in q['sql'].split('FROM')[1])
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return ' | '.join(row[-1] for row in cursor.fetchall())
+    
+    @pytest.mark.parametrize('params, index', [
+        ({'category': 1}, 'article_category_created_idx'),
+        ({'author': 1}, 'article_author_created_idx'),
+        ({'created_after': '2025-01-05', 'created_before': '2025-01-20'}, 'article_created_id_idx'),
+    ])
+    def test_filters_use_index_range_scans(self, params, index):
+        from django.db import connection
+        
+        if connection.vendor != 'sqlite':
+            pytest.skip('Plan assertions are written for SQLite')
+        from blog.cache import response_cache
+        response_cache.clear()
+        
+        plan = self.query_plan(**params)
+        
+        assert f'SEARCH blog_article USING INDEX {index}' in plan
+        assert 'SCAN blog_article' not in plan
+        assert 'TEMP B-TREE' not in plan  # ordered by the index, no sort step
+
+
+@pytest.mark.django_db
+class TestArticleListProjection:
+    """Test the stored excerpt/word_count and the content-free list"""
+    
+    def setup_method(self):
+        from blog.cache import response_cache
+        
+        response_cache.clear()
+        self.client = APIClient()
+        self.articles_url = reverse('article-list')
+        category = Category.objects.create(name='Tech')
+        author = User.objects.create_user(
+            email='author@example.com', first_name='Author', last_name='User', password='password123', is_active=True
+        )
+        self.content = ' '.join(['word'] * 100)
+        self.article = Article.objects.create(title='Long Article', content=self.content, author=author, category=category)
+    
+    def test_summary_computed_on_save(self):
+        assert self.article.word_count == 100
+        assert self.article.excerpt.endswith('...')
+        assert len(self.article.excerpt) <= 153
+        assert ' '.join(self.article.excerpt[:-3].split()) == self.article.excerpt[:-3]  # cut between words
+        
+        self.article.content = 'Short   and\nsweet'
+        self.article.save(update_fields=['content'])
+        self.article.refresh_from_db()
+        assert self.article.excerpt == 'Short and sweet'
+        assert self.article.word_count == 3
+    
+    def test_list_skips_content(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.articles_url)
+        
+        article = response.data['results'][0]
+        assert 'content' not in article
+        assert article['excerpt'] == self.article.excerpt
+        assert article['word_count'] == 100
+        assert not any('"blog_article"."content"' in q['sql'] for q in queries)
+    
+    def test_retrieve_keeps_content(self):
+        response = self.client.get(reverse('article-detail', kwargs={'pk': self.article.pk}))
+        
+        assert response.data['results']['content'] == self.content
+        assert response.data['results']['word_count'] == 100
+
+
+@pytest.mark.django_db
+class TestFastReadPath:
+    """Test that API_FAST_READS returns the exact bytes of the serializer path"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.articles_url = reverse('article-list')
+        self.category = Category.objects.create(name='Tech ✨')
+        moderators, _ = Group.objects.get_or_create(name='Moderators')
+        editors, _ = Group.objects.get_or_create(name='Editors')
+        self.authors = []
+        for i, groups in enumerate([[], [moderators], [moderators, editors]]):
+            author = User.objects.create_user(
+                email=f'author{i}@example.com', first_name='Zoë', last_name='Ünal', password='password123', is_active=True
+            )
+            author.groups.add(*groups)
+            self.authors.append(author)
+        for i in range(12):
+            Article.objects.create(
+                title=f'Article {i} "quoted" \\ \u2028 python',
+                content=f'Ligne séparée, tab\t et contrôle \x01 — python {i}',
+                author=self.authors[i % 3],
+                category=self.category
+            )
+    
+    def both_paths(self, url, params=None):
+        from django.test import override_settings
+        from blog.cache import response_cache
+        
+        bodies = []
+        for fast in [False, True]:
+            response_cache.clear()
+            with override_settings(API_FAST_READS=fast):
+                response = self.client.get(url, params)
+            assert response.status_code == status.HTTP_200_OK
+            bodies.append(response.content)
+        return bodies
+    
+    @pytest.mark.parametrize('params', [
+        {},
+        {'page_size': 5, 'count': 'exact'},
+        {'category': 1},
+        {'q': 'python', 'page_size': 5, 'page': 2},
+    ])
+    def test_article_list_identical(self, params):
+        if 'category' in params:
+            params = {'category': self.category.id}
+        slow, fast = self.both_paths(self.articles_url, params)
+        
+        assert fast == slow
+        assert b'\\u2028' in fast
+    
+    def test_article_list_next_page_identical(self):
+        first = self.client.get(self.articles_url, {'page_size': 5}).json()
+        slow, fast = self.both_paths(first['next'])
+        
+        assert fast == slow
+    
+    def test_review_list_identical(self):
+        from review.models import Review
+        
+        Review.objects.create(first_name='Zoë', last_name='Ünal', email='z@example.com', message='Très bien  !')
+        Review.objects.create(first_name='A', last_name='B', email='a@example.com', phone='0600000000',
+                              message='Bof', predicted_satisfaction=0, model_version='abc123')
+        slow, fast = self.both_paths(reverse('review-list'))
+        
+        assert fast == slow
+        assert len(json.loads(fast)) == 2
+
+
+@pytest.mark.django_db
+class TestArticleExport:
+    """Test the admin-only streaming article export"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.export_url = reverse('article-export')
+        self.category = Category.objects.create(name='Tech')
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com', first_name='Admin', last_name='User', password='password123',
+            is_active=True, is_staff=True
+        )
+        self.member = User.objects.create_user(
+            email='member@example.com', first_name='Member', last_name='User', password='password123', is_active=True
+        )
+        for i in range(5):
+            Article.objects.create(title=f'Article, "{i}"', content=f'Ligne 1\nLigne {i}', author=self.member, category=self.category)
+    
+    def test_ndjson(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.export_url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        assert [row['title'] for row in rows] == [f'Article, "{i}"' for i in range(5)]
+        assert rows[0]['author__email'] == 'member@example.com'
+        assert rows[0]['content'] == 'Ligne 1\nLigne 0'
+    
+    def test_csv_with_filters(self):
+        import csv
+        import io
+        
+        other = Category.objects.create(name='Anime')
+        Article.objects.create(title='Elsewhere', content='Content', author=self.member, category=other)
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.export_url, {'output': 'csv', 'category': self.category.id})
+        
+        assert response['Content-Type'].startswith('text/csv')
+        assert 'attachment; filename="articles-' in response['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        assert len(rows) == 5
+        assert rows[4]['title'] == 'Article, "4"'
+        assert rows[4]['content'] == 'Ligne 1\nLigne 4'
+    
+    def test_admin_only(self):
+        assert self.client.get(self.export_url).status_code == status.HTTP_401_UNAUTHORIZED
+        self.client.force_authenticate(user=self.member)
+        assert self.client.get(self.export_url).status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_unknown_output(self):
+        self.client.force_authenticate(user=self.admin_user)
+        
+        assert self.client.get(self.export_url, {'output': 'xml'}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestViewCounter:
+    """Test buffered article view counting"""
+    
+    def setup_method(self):
+        from blog.cache import response_cache
+        from blog.counters import view_counter
+        
+        response_cache.clear()
+        self.counter = view_counter
+        self.counter.flush_interval = 3600
+        self.counter.max_pending = 1000
+        self.counter.clear()
+        self.client = APIClient()
+        category = Category.objects.create(name='Tech')
+        author = User.objects.create_user(
+            email='author@example.com', first_name='Author', last_name='User', password='password123', is_active=True
+        )
+        self.articles = [
+            Article.objects.create(title=f'Article {i}', content='Content', author=author, category=category)
+            for i in range(3)
+        ]
+        self.url = reverse('article-detail', kwargs={'pk': self.articles[0].pk})
+    
+    def teardown_method(self):
+        from django.conf import settings
+        
+        self.counter.flush_interval = settings.BLOG_VIEW_COUNT_FLUSH_INTERVAL
+        self.counter.max_pending = settings.BLOG_VIEW_COUNT_MAX_PENDING
+        self.counter.clear()
+    
+    def test_retrieve_buffers_views(self):
+        self.client.get(self.url)
+        self.client.get(self.url)  # served from the response cache, still counted
+        
+        self.articles[0].refresh_from_db()
+        assert self.articles[0].view_count == 0
+        assert self.counter.pending(self.articles[0].pk) == 2
+        
+        response = self.client.get(reverse('article-list'), {'page_size': 10})
+        counts = {a['id']: a['view_count'] for a in response.data['results']}
+        assert counts[self.articles[0].pk] == 2
+    
+    def test_flush_is_one_update(self, django_assert_num_queries):
+        for i, article in enumerate(self.articles):
+            for _ in range(i + 1):
+                self.counter.increment(article.pk)
+        
+        with django_assert_num_queries(1):
+            assert self.counter.flush() == 6
+        
+        assert [a.view_count for a in Article.objects.order_by('id')] == [1, 2, 3]
+        assert self.counter.pending(self.articles[2].pk) == 0
+        assert self.counter.flush() == 0
+    
+    @pytest.mark.django_db(transaction=True)
+    def test_idle_worker_flushes(self):
+        """No view after the interval: the timer thread writes the pending ones anyway"""
+        from blog.counters import ViewCounter
+        
+        def view_count():
+            return Article.objects.get(pk=self.articles[0].pk).view_count
+        
+        counter = ViewCounter(flush_interval=0.05, max_pending=1000)
+        counter.increment(self.articles[0].pk)
+        counter.start()
+        try:
+            deadline = time.monotonic() + 5
+            while view_count() == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            counter.stop()
+        
+        assert view_count() == 1
+        assert counter.pending(self.articles[0].pk) == 0
+    
+    def test_edit_overlapping_a_flush_keeps_the_counts(self):
+        """A save of an instance loaded before a flush does not write view_count back"""
+        article = Article.objects.get(pk=self.articles[0].pk)
+        self.counter.increment(article.pk)
+        self.counter.increment(article.pk)
+        self.counter.flush()
+        
+        article.title = 'Edited meanwhile'
+        article.save()
+        
+        article.refresh_from_db()
+        assert article.title == 'Edited meanwhile'
+        assert article.view_count == 2
+    
+    def test_flush_when_buffer_full(self):
+        self.counter.max_pending = 3
+        for _ in range(3):
+            self.counter.increment(self.articles[1].pk)
+        
+        self.articles[1].refresh_from_db()
+        assert self.articles[1].view_count == 3
+    
+    def test_failed_flush_keeps_views(self, monkeypatch):
+        from django.db import DatabaseError
+        from django.db.models import QuerySet
+        
+        self.counter.increment(self.articles[0].pk)
+        
+        def broken_update(*args, **kwargs):
+            raise DatabaseError('database is locked')
+        
+        monkeypatch.setattr(QuerySet, 'update', broken_update)
+        assert self.counter.flush() == 0
+        assert self.counter.pending(self.articles[0].pk) == 1
+        
+        monkeypatch.undo()
+        assert self.counter.flush() == 1
+        self.articles[0].refresh_from_db()
+        assert self.articles[0].view_count == 1
+    
+    def test_missing_article_not_counted(self):
+        self.client.get(reverse('article-detail', kwargs={'pk': 999999}))
+        
+        assert self.counter.pending(999999) == 0
+
+
+@pytest.mark.django_db
+class TestBulkArticles:
+    """Test bulk article create/update"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.bulk_url = reverse('article-bulk')
+        self.tech = Category.objects.create(name='Tech')
+        self.anime = Category.objects.create(name='Anime')
+        self.author = User.objects.create_user(
+            email='author@example.com', first_name='Author', last_name='User', password='password123', is_active=True
+        )
+        self.other = User.objects.create_user(
+            email='other@example.com', first_name='Other', last_name='User', password='password123', is_active=True
+        )
+        self.moderator = User.objects.create_user(
+            email='moderator@example.com', first_name='Moderator', last_name='User', password='password123', is_active=True
+        )
+        moderators, _ = Group.objects.get_or_create(name='Moderators')
+        self.moderator.groups.add(moderators)
+        self.articles = [
+            Article.objects.create(title=f'Article {i}', content='Original content', author=self.author, category=self.tech)
+            for i in range(3)
+        ]
+    
+    def new_items(self, count, category=None):
+        return [
+            {'title': f'Bulk article {i}', 'content': f'Bulk content number {i}', 'category_id': (category or self.tech).id}
+            for i in range(count)
+        ]
+    
+    def test_bulk_create(self):
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post(self.bulk_url, {'articles': self.new_items(3)}, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['success'] is True
+        ids = [result['id'] for result in response.data['results']]
+        created = Article.objects.filter(pk__in=ids).order_by('id')
+        assert [a.title for a in created] == ['Bulk article 0', 'Bulk article 1', 'Bulk article 2']
+        assert all(a.author == self.author and a.word_count == 4 and a.excerpt == a.content for a in created)
+        assert Article.objects.filter(pk__in=ids, title__icontains='bulk').count() == 3
+    
+    def test_bulk_create_query_count_is_constant(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        self.client.force_authenticate(user=self.author)
+        counts = []
+        for size in [2, 20]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.bulk_url, {'articles': self.new_items(size)}, format='json')
+            assert response.status_code == status.HTTP_201_CREATED
+            counts.append(len(queries))
+        assert counts[0] == counts[1]
+    
+    def test_bulk_create_is_all_or_nothing(self):
+        items = self.new_items(3)
+        items[1]['title'] = 'ab'
+        items[2]['category_id'] = 999999
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post(self.bulk_url, {'articles': items}, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [r['status'] for r in response.data['results']] == [424, 400, 404]
+        assert 'title' in response.data['results'][1]['errors']
+        assert Article.objects.count() == 3
+    
+    def test_bulk_update(self):
+        self.client.force_authenticate(user=self.author)
+        items = [
+            {'id': self.articles[0].id, 'title': 'Renamed in bulk'},
+            {'id': self.articles[1].id, 'content': 'Brand new content here', 'category_id': self.anime.id},
+        ]
+        response = self.client.patch(self.bulk_url, {'articles': items}, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        first, second, third = Article.objects.order_by('id')
+        assert first.title == 'Renamed in bulk' and first.content == 'Original content'
+        assert second.content == 'Brand new content here' and second.word_count == 4 and second.category == self.anime
+        assert third.title == 'Article 2'
+    
+    def test_bulk_update_permissions(self):
+        items = [{'id': article.id, 'title': 'Edited by someone'} for article in self.articles]
+        
+        self.client.force_authenticate(user=self.other)
+        response = self.client.patch(self.bulk_url, {'articles': items}, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Article.objects.filter(title='Edited by someone').exists()
+        
+        self.client.force_authenticate(user=self.moderator)
+        response = self.client.patch(self.bulk_url, {'articles': items}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert Article.objects.filter(title='Edited by someone').count() == 3
+    
+    def test_bulk_update_unknown_and_duplicate_ids(self):
+        self.client.force_authenticate(user=self.author)
+        items = [
+            {'id': self.articles[0].id, 'title': 'First edit'},
+            {'id': self.articles[0].id, 'title': 'Second edit'},
+            {'id': 999999, 'title': 'Nowhere'},
+        ]
+        response = self.client.patch(self.bulk_url, {'articles': items}, format='json')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert [r['status'] for r in response.data['results']] == [424, 400, 404]
+    
+    def test_bulk_requires_list_and_active_user(self):
+        self.client.force_authenticate(user=self.author)
+        assert self.client.post(self.bulk_url, {'articles': []}, format='json').status_code == status.HTTP_400_BAD_REQUEST
+        
+        self.author.is_active = False
+        self.author.save()
+        response = self.client.post(self.bulk_url, {'articles': self.new_items(1)}, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    @pytest.mark.usefixtures('shared_response_cache')
+    def test_bulk_write_invalidates_response_cache(self, django_capture_on_commit_callbacks):
+        url = reverse('article-detail', kwargs={'pk': self.articles[0].pk})
+        self.client.get(url)
+        self.client.force_authenticate(user=self.author)
+        with django_capture_on_commit_callbacks(execute=True):
+            self.client.patch(self.bulk_url, {'articles': [{'id': self.articles[0].id, 'title': 'Fresh title'}]},
+                              format='json')
+        self.client.force_authenticate(user=None)
+        
+        response = self.client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results']['title'] == 'Fresh title'
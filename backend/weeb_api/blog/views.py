@@ -1,10 +1,29 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, IsAdminUser
+from rest_framework.renderers import BrowsableAPIRenderer
+from django.conf import settings
 from .models import Article, Category
-from .serializers import ArticleReadSerializer, ArticleWriteSerializer, CategorySerializer
+from .serializers import ArticleReadSerializer, ArticleListSerializer, ArticleWriteSerializer, CategorySerializer, ARTICLE_LIST_PROJECTION
 from .permissions import IsOwnerOrModeratorOrAdmin, IsActiveUser
 from users.models import User
+from users.serializers import group_names_by_user
+from users.authentication import model_user
+from weeb_api.pagination import KeysetPagination, PageNumberEnvelopePagination
+from weeb_api.renderers import FastJSONRenderer
+from weeb_api.export import export_response
+from .search import search_articles
+from .cache import cached_response
+from .filters import ArticleFilterBackend
+from .counters import view_counter
+from .bulk import bulk_create_articles, bulk_update_articles
+
+
+ARTICLE_EXPORT_FIELDS = [
+    'id', 'title', 'content', 'excerpt', 'word_count', 'view_count', 'created_at',
+    'author_id', 'author__email', 'category_id', 'category__name',
+]
 
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -13,9 +32,17 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     GET /api/categories/ --> list()
     GET /api/categories/{id}/ --> retrieve()
     """
-    queryset = Category.objects.all()
+    queryset = Category.objects.all().order_by('id')
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    
+    @cached_response('categories')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @cached_response('categories')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 
 class BlogViewSet(viewsets.ModelViewSet):
@@ -25,48 +52,124 @@ class BlogViewSet(viewsets.ModelViewSet):
     - Authenticated + Active: can create articles
     - Author/Moderator/Admin: can update/delete articles
     
-    GET /api/articles/ --> list()
+    GET /api/articles/ --> list() [?cursor=, ?page_size=, ?count=exact|approximate]
+    GET /api/articles/?q=... --> list() [full-text search, ranked, ?page=]
+    (list filters: ?category=, ?author=, ?created_after=, ?created_before=)
     GET /api/articles/{id}/ --> retrieve()
     POST /api/articles/ --> create() [requires active user]
     PUT /api/articles/{id}/ --> update() [requires owner/moderator/admin]
     PATCH /api/articles/{id}/ --> partial_update() [requires owner/moderator/admin]
     DELETE /api/articles/{id}/ --> destroy() [requires owner/moderator/admin]
+    GET /api/articles/export/ --> export() [admin only, ?output=ndjson|csv, list filters apply]
+    POST /api/articles/bulk/ --> bulk() [create many, requires active user]
+    PATCH /api/articles/bulk/ --> bulk() [update many, each one owner/moderator/admin]
     """
-    queryset = Article.objects.all().select_related('author', 'category').order_by('-created_at')
+    queryset = (
+        Article.objects.all()
+        .select_related('author', 'category')
+        .prefetch_related('author__groups')  # nested UserSerializer.get_groups
+        .order_by('-created_at', '-id')
+    )
+    pagination_class = KeysetPagination
+    filter_backends = [ArticleFilterBackend]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Cards show the stored excerpt: never read the article bodies
+            queryset = queryset.defer('content')
+        return queryset
     
     def get_serializer_class(self):
         """Use different serializers for read vs write operations"""
         if self.action in ['create', 'update', 'partial_update']:
             return ArticleWriteSerializer
+        if self.action == 'list':
+            return ArticleListSerializer
         return ArticleReadSerializer
     
     def get_permissions(self):
         """
         Set permissions based on action:
         - list/retrieve: public (IsAuthenticatedOrReadOnly)
-        - create: authenticated + active users only
+        - create/bulk: authenticated + active users only (bulk checks object permissions per item)
         - update/partial_update/destroy: owner/moderator/admin only
         """
         if self.action in ['list', 'retrieve']:
             permission_classes = [IsAuthenticatedOrReadOnly]
-        elif self.action == 'create':
+        elif self.action in ['create', 'bulk']:
             permission_classes = [IsAuthenticated, IsActiveUser]
+        elif self.action == 'export':
+            permission_classes = [IsAdminUser]
         else:  # update, partial_update, destroy
             permission_classes = [IsAuthenticated, IsActiveUser, IsOwnerOrModeratorOrAdmin]
         
         return [permission() for permission in permission_classes]
     
+    @cached_response('articles', 'categories', 'users')
     def list(self, request, *args, **kwargs):
-        """GET /api/articles/ - List all articles"""
-        queryset = self.get_queryset()
+        """GET /api/articles/ - List articles, newest first, one cursor page at a time"""
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        
+        search = request.query_params.get('q', '').strip()
+        if search:
+            # Ranked by relevance: no stable keyset, so page numbers
+            paginator = PageNumberEnvelopePagination()
+            queryset = search_articles(queryset, search)
+        
+        if settings.API_FAST_READS:
+            # Same JSON as ArticleListSerializer, built from .values() rows
+            page = paginator.paginate_queryset(ARTICLE_LIST_PROJECTION.values(queryset), request, view=self)
+            data = ARTICLE_LIST_PROJECTION.render(page)
+            groups = group_names_by_user({item['author']['id'] for item in data})
+            for item in data:
+                item['author']['groups'] = groups.get(item['author']['id'], [])
+                item['view_count'] += view_counter.pending(item['id'])
+        else:
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            data = self.get_serializer(page, many=True).data
+        return paginator.get_paginated_response(data)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """GET /api/articles/export/ - Stream every article as NDJSON or CSV (admin only)"""
+        queryset = self.filter_queryset(Article.objects.order_by('id'))
+        return export_response(request, queryset, ARTICLE_EXPORT_FIELDS, 'articles')
+    
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        """POST/PATCH /api/articles/bulk/ - Create or update many articles in one transaction"""
+        items = request.data.get('articles') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({
+                'success': False,
+                'message': 'Expected a non-empty "articles" list.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.BLOG_BULK_MAX_ITEMS:
+            return Response({
+                'success': False,
+                'message': f'At most {settings.BLOG_BULK_MAX_ITEMS} articles per request.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if request.method == 'POST':
+            code, results = bulk_create_articles(request, items)
+        else:
+            code, results = bulk_update_articles(request, self, items)
         
-        serializer = self.get_serializer(queryset, many=True)
         return Response({
-            'success': True,
-            'count': queryset.count(),
-            'results': serializer.data
-        }, status=status.HTTP_200_OK)
+            'success': code < 400,
+            'results': results
+        }, status=code)
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Here rather than in retrieve() so that cached responses count too
+        if self.action == 'retrieve' and response.status_code == 200:
+            view_counter.increment(int(self.kwargs['pk']))
+        return super().finalize_response(request, response, *args, **kwargs)
     
+    @cached_response('articles', 'categories', 'users')
     def retrieve(self, request, *args, **kwargs):
         """GET /api/articles/{id}/ - Get single article"""
         article = self.get_object()
@@ -106,7 +209,7 @@ class BlogViewSet(viewsets.ModelViewSet):
         # Create article with current user as author
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        article = serializer.save(author=request.user)
+        article = serializer.save(author=model_user(request.user))
         
         # Return with read serializer to include full author/category data
         read_serializer = ArticleReadSerializer(article)
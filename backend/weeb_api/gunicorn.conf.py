@@ -0,0 +1,48 @@
+"""
+Gunicorn configuration — chargé automatiquement depuis backend/weeb_api/
+(`gunicorn weeb_api.wsgi:application`).
+
+The application, and with it the satisfaction model, is imported once in the
+master (preload_app) and the workers are forked from it, so the model is
+shared copy-on-write instead of being unpickled by every worker.
+"""
+import os
+import signal
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+preload_app = True
+
+
+def pre_fork(server, worker):
+    from review.ml import freeze_for_fork
+    freeze_for_fork()
+
+
+def post_worker_init(worker):
+    from blog.counters import view_counter
+    from review.ml import memory_usage, request_reload
+    # `kill -USR2 <worker pid>` makes the worker check the model registry now
+    signal.signal(signal.SIGUSR2, request_reload)
+    # Buffered article views are written even while the worker is idle
+    view_counter.start()
+
+    usage = memory_usage()
+    worker.log.info(
+        "Worker %s memory: rss=%s kB pss=%s kB shared=%s kB private=%s kB",
+        usage['pid'], usage.get('rss'), usage.get('pss'), usage.get('shared'), usage.get('private'),
+    )
+
+
+def worker_exit(server, worker):
+    from blog.counters import view_counter
+    # Write the buffered article views before the worker goes away
+    view_counter.stop()
+    written = view_counter.flush()
+    worker.log.info("Worker %s flushed %s article view(s)", worker.pid, written)
+
+
+def when_ready(server):
+    from review.ml import memory_usage
+    usage = memory_usage()
+    server.log.info("Master memory: rss=%s kB", usage.get('rss'))
@@ -4,7 +4,7 @@ from .models import Review
 # Register your models here.
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ['first_name', 'last_name', 'email', 'phone', 'predicted_satisfaction', 'created_at']
-    list_filter = ['created_at', 'predicted_satisfaction']
+    list_display = ['first_name', 'last_name', 'email', 'phone', 'predicted_satisfaction', 'satisfaction', 'model_version', 'created_at']
+    list_filter = ['created_at', 'predicted_satisfaction', 'satisfaction', 'scoring_pending', 'model_version']
     search_fields = ['first_name', 'last_name', 'email', 'phone']
-    readonly_fields = ['predicted_satisfaction', 'created_at']
+    readonly_fields = ['predicted_satisfaction', 'scoring_pending', 'model_version', 'created_at']
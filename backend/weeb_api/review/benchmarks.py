@@ -0,0 +1,57 @@
+"""
+Timing helpers shared by the review benchmark commands
+(export_linear_model --benchmark, benchmark_inference).
+"""
+import os
+import statistics
+import time
+import tracemalloc
+
+import pandas as pd
+from django.conf import settings
+
+
+# Labelled messages train_model.py learns from; realistic benchmark inputs
+DATASET_PATH = os.path.join(settings.BASE_DIR.parent.parent, 'weeb_satisfaction_dataset_partial.csv')
+
+
+def dataset_messages():
+    return pd.read_csv(DATASET_PATH)['message'].dropna().astype(str).tolist()
+
+
+def percentiles(timings):
+    """p50/p95/p99 and mean of a list of latencies (µs)."""
+    timings = sorted(timings)
+
+    def rank(p):
+        return timings[min(len(timings) - 1, max(0, round(p * len(timings)) - 1))]
+
+    return {
+        'p50': statistics.median(timings),
+        'p95': rank(0.95),
+        'p99': rank(0.99),
+        'mean': statistics.fmean(timings),
+        'samples': len(timings),
+    }
+
+
+def time_calls(func, inputs, repeat=1):
+    """Latency in µs of func(item) for every item of ``inputs``, ``repeat`` times over."""
+    timings = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            func(item)
+            timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def measure_allocation(func):
+    """Run func() and return (result, bytes still allocated by it)."""
+    tracemalloc.start()
+    try:
+        result = func()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, allocated
@@ -0,0 +1,124 @@
+"""
+Compiled linear scorer.
+
+train_model.py usually picks LogisticRegression or LinearSVC on top of
+TfidfVectorizer. Such a pipeline is just a vocabulary lookup, an idf
+weighting, an L2 normalization and a dot product, so it can be flattened
+into a few arrays and scored with plain NumPy, without sklearn's object
+dispatch, input validation and sparse-matrix construction on every call.
+
+export_linear_model() writes the fitted pipeline to an ``.npz`` artifact;
+LinearScorer loads it and exposes the same predict / decision_function /
+predict_proba interface as the pipeline, so it can be published to the
+model registry and served by review.ml like any other artifact.
+"""
+import re
+
+import numpy as np
+
+
+SUPPORTED_CLASSIFIERS = {'LogisticRegression': 'logistic', 'LinearSVC': 'svm'}
+
+
+def export_linear_model(pipeline, path):
+    """
+    Flatten a fitted TfidfVectorizer + linear classifier pipeline into an
+    ``.npz`` artifact. Raises ValueError for anything the scorer cannot
+    reproduce exactly.
+    """
+    vectorizer, classifier = pipeline[0], pipeline[-1]
+    kind = SUPPORTED_CLASSIFIERS.get(type(classifier).__name__)
+
+    if len(pipeline) != 2 or type(vectorizer).__name__ != 'TfidfVectorizer':
+        raise ValueError('Only TfidfVectorizer + linear classifier pipelines can be exported.')
+    if kind is None:
+        raise ValueError(f'Unsupported classifier: {type(classifier).__name__}')
+    if len(classifier.classes_) != 2:
+        raise ValueError('Only binary classifiers can be exported.')
+    if (vectorizer.analyzer != 'word' or vectorizer.tokenizer or vectorizer.preprocessor
+            or vectorizer.strip_accents or vectorizer.stop_words or not vectorizer.use_idf):
+        raise ValueError('Only the default word analyzer with idf weighting can be exported.')
+
+    vocabulary = vectorizer.vocabulary_
+    terms = [None] * len(vocabulary)
+    for term, index in vocabulary.items():
+        terms[index] = term
+    # Terms are \w tokens joined by spaces, so a newline-separated UTF-8 blob
+    # is unambiguous and far smaller than a fixed-width unicode array
+    terms_blob = np.frombuffer('\n'.join(terms).encode('utf-8'), dtype=np.uint8)
+
+    np.savez(
+        path,
+        kind=kind,
+        terms=terms_blob,
+        idf=vectorizer.idf_.astype(np.float32),
+        coef=classifier.coef_.ravel().astype(np.float32),
+        intercept=np.float32(classifier.intercept_[0]),
+        classes=classifier.classes_,
+        token_pattern=vectorizer.token_pattern,
+        lowercase=vectorizer.lowercase,
+        ngram_range=np.array(vectorizer.ngram_range),
+        norm=str(vectorizer.norm),
+        sublinear_tf=vectorizer.sublinear_tf,
+    )
+
+
+class LinearScorer:
+    """Pure-NumPy scorer for an artifact written by export_linear_model()."""
+
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as data:
+            self.kind = str(data['kind'])
+            self.idf = data['idf']
+            self.coef = data['coef']
+            self.intercept = float(data['intercept'])
+            self.classes_ = data['classes']
+            self.token_re = re.compile(str(data['token_pattern']))
+            self.lowercase = bool(data['lowercase'])
+            self.min_n, self.max_n = (int(n) for n in data['ngram_range'])
+            self.norm = str(data['norm'])
+            self.sublinear_tf = bool(data['sublinear_tf'])
+            terms = data['terms'].tobytes().decode('utf-8').split('\n')
+            self.vocabulary = {term: index for index, term in enumerate(terms)}
+
+        # Only logistic models have probabilities; keep hasattr() honest
+        if self.kind == 'logistic':
+            self.predict_proba = self._predict_proba
+
+    def _term_counts(self, message):
+        if self.lowercase:
+            message = message.lower()
+        tokens = self.token_re.findall(message)
+        vocabulary = self.vocabulary
+        counts = {}
+        for n in range(self.min_n, self.max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                index = vocabulary.get(tokens[i] if n == 1 else ' '.join(tokens[i:i + n]))
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+        return counts
+
+    def decision_function(self, messages):
+        scores = np.full(len(messages), self.intercept, dtype=np.float32)
+        for row, message in enumerate(messages):
+            counts = self._term_counts(message)
+            if not counts:
+                continue
+            indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            if self.sublinear_tf:
+                weights = 1 + np.log(weights)
+            weights *= self.idf[indices]
+            if self.norm == 'l2':
+                weights /= np.sqrt(weights @ weights)
+            elif self.norm == 'l1':
+                weights /= np.abs(weights).sum()
+            scores[row] += weights @ self.coef[indices]
+        return scores.astype(float)
+
+    def _predict_proba(self, messages):
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(messages)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, messages):
+        return self.classes_[(self.decision_function(messages) > 0).astype(int)]
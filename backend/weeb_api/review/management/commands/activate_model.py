@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from review.ml import get_registry
+
+
+class Command(BaseCommand):
+    help = 'List registry versions, or activate one of them (deploy or rollback)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('version', nargs='?', help='Version to activate; omit to list versions')
+
+    def handle(self, *args, **options):
+        registry = get_registry()
+
+        if not options['version']:
+            manifest = registry.read_manifest()
+            for entry in manifest['versions']:
+                marker = '*' if entry['version'] == manifest.get('current') else ' '
+                self.stdout.write(f"{marker} {entry['version']:<20} {entry['published_at']}")
+            return
+
+        try:
+            registry.activate(options['version'])
+        except KeyError as e:
+            raise CommandError(e.args[0])
+        self.stdout.write(self.style.SUCCESS(f"Model {options['version']} activated"))
@@ -0,0 +1,172 @@
+import json
+import os
+import platform
+import threading
+import time
+from datetime import datetime, timezone
+
+import sklearn
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from review import ml
+from review.benchmarks import dataset_messages, percentiles, time_calls
+from review.scoring import PredictionCache, prediction_cache, score_messages
+from review.views import predict
+
+
+BATCH_SIZES = [1, 10, 100, 500]
+MESSAGE_LENGTHS = [50, 200, 1000, 5000]
+CONCURRENCY_LEVELS = [1, 4, 8]
+MIN_SAMPLES_TO_COMPARE = 20
+
+
+def messages_of_length(messages, length):
+    """Dataset messages glued together until each one is ``length`` characters long."""
+    result = []
+    for offset in range(len(messages)):
+        text = ''
+        i = offset
+        while len(text) < length:
+            text += messages[i % len(messages)] + ' '
+            i += 1
+        result.append(text[:length])
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark satisfaction inference (cold/warm, single/batched, message length, '
+        'concurrent /predict requests) and write the results as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--artifact', default=settings.REVIEW_MODEL_PATH, help='Model artifact to benchmark')
+        parser.add_argument('--output', required=True, help='Where to write the JSON results')
+        parser.add_argument('--repeat', type=int, default=3, help='Passes over the dataset per scenario')
+        parser.add_argument('--baseline', help='Previous results; fail if a p95 regressed beyond --max-regression')
+        parser.add_argument('--max-regression', type=float, default=0.25, help='Allowed p95 slowdown ratio (0.25 = +25%%)')
+
+    def handle(self, *args, **options):
+        artifact, repeat = options['artifact'], options['repeat']
+        if not os.path.exists(artifact):
+            raise CommandError(f'Model artifact not found: {artifact} (run train_model.py first)')
+
+        messages = dataset_messages()
+        no_cache = PredictionCache(0)
+        scenarios = {}
+
+        # Cold: load the artifact and score a first message
+        start = time.perf_counter()
+        model = ml.read_artifact(artifact)
+        load_ms = (time.perf_counter() - start) * 1e3
+        first = time_calls(lambda m: score_messages(model, [m], cache=no_cache), messages[:1])
+        scenarios['cold.load_ms'] = {'p50': load_ms, 'p95': load_ms, 'p99': load_ms, 'mean': load_ms, 'samples': 1}
+        scenarios['cold.first_message'] = percentiles(first)
+
+        # Warm, one message per call: the scoring done inside ReviewViewSet.create
+        scenarios['single.warm'] = percentiles(
+            time_calls(lambda m: score_messages(model, [m], cache=no_cache), messages, repeat)
+        )
+
+        for size in BATCH_SIZES:
+            batches = [messages[i:i + size] for i in range(0, len(messages), size)]
+            stats = percentiles(time_calls(lambda b: score_messages(model, b, cache=no_cache), batches, repeat))
+            stats['per_message_us'] = stats['p50'] / size
+            scenarios[f'batch.{size}'] = stats
+
+        for length in MESSAGE_LENGTHS:
+            scenarios[f'length.{length}'] = percentiles(
+                time_calls(lambda m: score_messages(model, [m], cache=no_cache), messages_of_length(messages, length), repeat)
+            )
+
+        scenarios.update(self.benchmark_endpoint(artifact, messages, repeat))
+
+        results = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'artifact': os.path.abspath(artifact),
+            'model_version': ml.get_current().version,
+            'model': type(model).__name__,
+            'python': platform.python_version(),
+            'sklearn': sklearn.__version__,
+            'cpu_count': os.cpu_count(),
+            'unit': 'µs (cold.load_ms in ms)',
+            'scenarios': scenarios,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+        self.print_summary(scenarios)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options['baseline']:
+            self.compare(options['baseline'], scenarios, options['max_regression'])
+
+    def benchmark_endpoint(self, artifact, messages, repeat):
+        """POST /api/predict/ through the real view, from several threads at once."""
+        ml.load_model(artifact)
+        factory = RequestFactory()
+        saved_size = prediction_cache.max_size
+        prediction_cache.max_size = 0
+        prediction_cache.clear()
+
+        def call(message):
+            request = factory.post('/api/predict/', json.dumps({'features': message}), content_type='application/json')
+            response = predict(request)
+            if response.status_code != 200:
+                raise CommandError(f'/api/predict/ answered {response.status_code}: {response.content[:200]}')
+
+        scenarios = {}
+        try:
+            for threads in CONCURRENCY_LEVELS:
+                timings, lock = [], threading.Lock()
+
+                def worker(chunk):
+                    local = time_calls(call, chunk)
+                    with lock:
+                        timings.extend(local)
+
+                workload = messages * repeat
+                chunks = [workload[i::threads] for i in range(threads)]
+                pool = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+                start = time.perf_counter()
+                for thread in pool:
+                    thread.start()
+                for thread in pool:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+
+                stats = percentiles(timings)
+                stats['requests_per_s'] = len(timings) / elapsed
+                scenarios[f'endpoint.concurrency_{threads}'] = stats
+        finally:
+            prediction_cache.max_size = saved_size
+        return scenarios
+
+    def print_summary(self, scenarios):
+        self.stdout.write(f"\n{'Scenario':<28} {'p50':>10} {'p95':>10} {'p99':>10}")
+        self.stdout.write('-' * 62)
+        for name, stats in scenarios.items():
+            extra = ''
+            if 'per_message_us' in stats:
+                extra = f"  ({stats['per_message_us']:.0f} µs/message)"
+            elif 'requests_per_s' in stats:
+                extra = f"  ({stats['requests_per_s']:.0f} req/s)"
+            self.stdout.write(f"{name:<28} {stats['p50']:>10.0f} {stats['p95']:>10.0f} {stats['p99']:>10.0f}{extra}")
+
+    def compare(self, baseline_path, scenarios, max_regression):
+        with open(baseline_path) as f:
+            baseline = json.load(f)['scenarios']
+
+        regressions = []
+        for name, stats in scenarios.items():
+            # Single-sample cold timings are too noisy to gate on
+            if name in baseline and stats['samples'] >= MIN_SAMPLES_TO_COMPARE and baseline[name]['p95'] > 0:
+                ratio = stats['p95'] / baseline[name]['p95'] - 1
+                if ratio > max_regression:
+                    regressions.append(f'{name}: p95 +{ratio * 100:.0f}%')
+
+        if regressions:
+            raise CommandError('Latency regressions: ' + ', '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No p95 regression above {max_regression * 100:.0f}% vs {baseline_path}'))
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from review.benchmarks import dataset_messages, measure_allocation, percentiles, time_calls
+from review.linear import LinearScorer, export_linear_model
+from review.ml import read_artifact
+
+
+class Command(BaseCommand):
+    help = 'Export the trained pipeline as a compiled linear scorer (.npz) and check it against the pipeline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', default=settings.REVIEW_MODEL_PATH, help='Pickled pipeline from train_model.py')
+        parser.add_argument('--output', help='Destination .npz (defaults to the source path with .npz)')
+        parser.add_argument('--benchmark', action='store_true', help='Compare latency and memory with the pickled pipeline')
+        parser.add_argument('--repeat', type=int, default=20, help='Benchmark repetitions')
+
+    def handle(self, *args, **options):
+        source = options['source']
+        output = options['output'] or os.path.splitext(source)[0] + '.npz'
+
+        pipeline = read_artifact(source)
+        try:
+            export_linear_model(pipeline, output)
+        except ValueError as e:
+            raise CommandError(str(e))
+        scorer = LinearScorer(output)
+
+        messages = dataset_messages()
+        gap = np.abs(pipeline.decision_function(messages) - scorer.decision_function(messages)).max()
+        same = (pipeline.predict(messages) == scorer.predict(messages)).all()
+        if not same or gap > 1e-4:
+            os.remove(output)
+            raise CommandError(f'Exported scorer diverges from the pipeline (max gap {gap:.2e})')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {output} ({os.path.getsize(output) / 1024:.0f} kB), '
+            f'max decision gap {gap:.2e} on {len(messages)} messages'
+        ))
+
+        if options['benchmark']:
+            self.benchmark(source, output, messages, options['repeat'])
+
+    def benchmark(self, source, output, messages, repeat):
+        pipeline, pipeline_bytes = measure_allocation(lambda: read_artifact(source))
+        scorer, scorer_bytes = measure_allocation(lambda: read_artifact(output))
+
+        self.stdout.write(f"\n{'':<22} {'Pipeline':>14} {'Compiled':>14}")
+        self.stdout.write('-' * 52)
+        self.stdout.write(f"{'Artifact on disk':<22} {os.path.getsize(source) / 1024:>11.0f} kB {os.path.getsize(output) / 1024:>11.0f} kB")
+        self.stdout.write(f"{'Memory once loaded':<22} {pipeline_bytes / 1024:>11.0f} kB {scorer_bytes / 1024:>11.0f} kB")
+
+        for label, batch_size in [('1 message', 1), ('batch of 100', 100)]:
+            batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+            pipeline_stats = percentiles(time_calls(pipeline.decision_function, batches, repeat))
+            scorer_stats = percentiles(time_calls(scorer.decision_function, batches, repeat))
+            for stat in ['p50', 'p95']:
+                self.stdout.write(f"{label + ' ' + stat:<22} {pipeline_stats[stat]:>11.0f} µs {scorer_stats[stat]:>11.0f} µs")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from review.ml import get_registry
+
+
+class Command(BaseCommand):
+    help = 'Publish a trained model artifact into the model registry (workers pick it up without restart)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('artifact', help='Path to the .pkl/.joblib artifact (e.g. ../weeb_api_model.pkl)')
+        parser.add_argument('--name', dest='model_version', help='Version name (defaults to the artifact sha256)')
+        parser.add_argument('--no-activate', action='store_true', help='Publish without making it the current version')
+
+    def handle(self, *args, **options):
+        registry = get_registry()
+        try:
+            version = registry.publish(
+                options['artifact'],
+                version=options['model_version'],
+                activate=not options['no_activate'],
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        state = 'published' if options['no_activate'] else 'published and activated'
+        self.stdout.write(self.style.SUCCESS(f'Model {version} {state} in {registry.root}'))
@@ -0,0 +1,115 @@
+import json
+import multiprocessing
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from review.ml import get_current, get_registry
+from review.models import Review
+from review.tasks import rescore_range
+
+
+def _rescore_chunk(args):
+    index, start, end, only_stale = args
+    return index, rescore_range(start, end, only_stale)
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresh predicted_satisfaction on existing reviews with the current model, '
+        'in primary-key ordered chunks, resumable from a checkpoint'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Reviews per model call / bulk_update')
+        parser.add_argument('--workers', type=int, default=1, help='Processes to fan the chunks out to')
+        parser.add_argument('--only-stale', action='store_true', help='Skip reviews already scored by the current version')
+        parser.add_argument('--resume', action='store_true', help='Continue from the checkpoint of an interrupted run')
+        parser.add_argument('--checkpoint', help='Checkpoint file (defaults to rescore_checkpoint.json in the registry dir)')
+
+    def read_checkpoint(self, path, model_version):
+        try:
+            with open(path) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if checkpoint.get('model_version') != model_version:
+            self.stdout.write(self.style.WARNING('Checkpoint is for another model version, starting over'))
+            return 0
+        return checkpoint['last_id']
+
+    def write_checkpoint(self, path, model_version, last_id):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'model_version': model_version, 'last_id': last_id}, f)
+        os.replace(tmp_path, path)
+
+    def chunk_bounds(self, start, chunk_size, only_stale, model_version):
+        """(start, end] primary-key ranges of ``chunk_size`` reviews each."""
+        queryset = Review.objects.filter(pk__gt=start).exclude(message='')
+        if only_stale:
+            queryset = queryset.exclude(model_version=model_version)
+        pks = queryset.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=10000)
+
+        bounds, low, count, pk = [], start, 0, start
+        for pk in pks:
+            count += 1
+            if count == chunk_size:
+                bounds.append((low, pk))
+                low, count = pk, 0
+        if count:
+            bounds.append((low, pk))
+        return bounds
+
+    def handle(self, *args, **options):
+        model, model_version = get_current()
+        if model is None:
+            raise CommandError('No satisfaction model available')
+
+        checkpoint_path = options['checkpoint'] or os.path.join(get_registry().root, 'rescore_checkpoint.json')
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+        start = self.read_checkpoint(checkpoint_path, model_version) if options['resume'] else 0
+
+        bounds = self.chunk_bounds(start, options['chunk_size'], options['only_stale'], model_version)
+        if not bounds:
+            self.stdout.write(self.style.SUCCESS('Nothing to rescore'))
+            return
+        self.stdout.write(f'Rescoring {len(bounds)} chunk(s) with model {model_version or "(unversioned)"} from review #{start}')
+
+        tasks = [(index, low, high, options['only_stale']) for index, (low, high) in enumerate(bounds)]
+        done, watermark, rows = set(), 0, 0
+        started = time.perf_counter()
+
+        if options['workers'] > 1:
+            # Children are forked with the model already loaded; each opens its own DB connection
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(options['workers'])
+            results = pool.imap_unordered(_rescore_chunk, tasks)
+        else:
+            pool = None
+            results = map(_rescore_chunk, tasks)
+
+        try:
+            for index, scored in results:
+                rows += scored
+                done.add(index)
+                # Only checkpoint past chunks that are all finished
+                while watermark in done:
+                    watermark += 1
+                if watermark:
+                    self.write_checkpoint(checkpoint_path, model_version, bounds[watermark - 1][1])
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f'  {len(done)}/{len(bounds)} chunks, {rows} rows, {rows / elapsed:.0f} rows/s')
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        os.remove(checkpoint_path)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescored {rows} review(s) in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)'
+        ))
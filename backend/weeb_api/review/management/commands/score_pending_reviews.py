@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from review.ml import get_model
+from review.tasks import drain_pending_reviews
+
+
+class Command(BaseCommand):
+    help = 'Score reviews queued by the deferred scoring mode (REVIEW_SCORING_MODE=deferred)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Reviews scored per model call')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the queue instead of exiting once drained')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls in --loop mode')
+
+    def handle(self, *args, **options):
+        if get_model() is None:
+            self.stdout.write(self.style.ERROR('No satisfaction model available, nothing scored'))
+            return
+
+        while True:
+            scored = drain_pending_reviews(options['batch_size'])
+            if scored:
+                self.stdout.write(self.style.SUCCESS(f'Scored {scored} review(s)'))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,63 @@
+import os
+import pickle
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from review.ml import get_registry, read_artifact
+from review.training import DEFAULT_N_FEATURES, build_incremental_model, train_incremental
+
+
+TRAINER = 'incremental'
+
+
+class Command(BaseCommand):
+    help = (
+        'Update the hashing/SGD satisfaction model with labelled reviews added since the last run '
+        'and publish it to the model registry. Labels set later on older reviews need --from-scratch.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Reviews per partial_fit call')
+        parser.add_argument('--from-scratch', action='store_true', help='Ignore the previous incremental model')
+        parser.add_argument('--n-features', type=int, default=DEFAULT_N_FEATURES, help='Hashing space size (new models only)')
+        parser.add_argument('--no-activate', action='store_true', help='Publish without making it the current version')
+
+    def latest_incremental_version(self, registry):
+        for entry in reversed(registry.read_manifest()['versions']):
+            if entry.get('metadata', {}).get('trainer') == TRAINER:
+                return entry
+        return None
+
+    def handle(self, *args, **options):
+        registry = get_registry()
+        previous = None if options['from_scratch'] else self.latest_incremental_version(registry)
+
+        if previous:
+            model = read_artifact(os.path.join(registry.root, previous['file']))
+            since_id = previous['metadata']['last_review_id']
+            total_rows = previous['metadata']['rows']
+            self.stdout.write(f"Resuming from {previous['version']} (reviews after #{since_id})")
+        else:
+            model = build_incremental_model(options['n_features'])
+            since_id, total_rows = 0, 0
+
+        model, last_id, rows = train_incremental(model, since_id, options['chunk_size'])
+        if not rows:
+            self.stdout.write(self.style.WARNING('No new labelled reviews, model unchanged'))
+            return
+
+        with tempfile.NamedTemporaryFile(suffix='.pkl', delete=False) as f:
+            pickle.dump(model, f)
+        try:
+            version = registry.publish(
+                f.name,
+                activate=not options['no_activate'],
+                metadata={'trainer': TRAINER, 'last_review_id': last_id, 'rows': total_rows + rows},
+            )
+        finally:
+            os.remove(f.name)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Trained on {rows} new review(s) ({total_rows + rows} in total), published as {version}'
+        ))
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0003_review_predicted_satisfaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='scoring_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('scoring_pending', True)), fields=['id'], name='review_scoring_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0004_review_scoring_pending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='model_version',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0005_review_model_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='satisfaction',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
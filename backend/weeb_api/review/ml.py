@@ -0,0 +1,185 @@
+"""
+Satisfaction model loading.
+
+The active model is loaded once per process and kept in a module-level slot.
+Under gunicorn with ``preload_app`` (see gunicorn.conf.py), wsgi.py calls
+load_model() in the master before workers are forked, so every worker shares
+the same TF-IDF vocabulary and coefficient pages copy-on-write instead of
+unpickling its own copy.
+
+When a model registry exists (REVIEW_MODEL_REGISTRY_DIR, see registry.py) the
+active version comes from its manifest, which get_current() polls every
+REVIEW_MODEL_POLL_INTERVAL seconds (or right away after SIGUSR2). A new
+version is loaded on the side and swapped in with a single assignment:
+requests already running keep the model they started with. Without a
+registry the pickle from train_model.py (REVIEW_MODEL_PATH) is used.
+
+Artifacts ending in ``.joblib`` are loaded with ``mmap_mode='r'``: their
+numpy arrays are memory-mapped from the page cache and shared even across
+independent processes. ``.npz`` artifacts are compiled linear scorers
+(see linear.py).
+"""
+import gc
+import logging
+import os
+import pickle
+import resource
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from .registry import ModelRegistry, file_digest
+
+
+logger = logging.getLogger(__name__)
+
+LoadedModel = namedtuple('LoadedModel', ['model', 'version'])
+
+_current = LoadedModel(None, '')
+_loaded = False
+_manifest_mtime = None
+_next_poll = 0.0
+_reload_lock = threading.Lock()
+
+
+def get_registry():
+    return ModelRegistry(settings.REVIEW_MODEL_REGISTRY_DIR)
+
+
+def read_artifact(path):
+    """
+    Load a model artifact: pickle, joblib (memory-mapped) or the compiled
+    linear scorer (.npz, see linear.py).
+    """
+    if path.endswith('.npz'):
+        from .linear import LinearScorer
+        return LinearScorer(path)
+    if path.endswith('.joblib'):
+        import joblib
+        return joblib.load(path, mmap_mode='r')
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _resolve_artifact():
+    """Return (version, path) of the model to serve."""
+    registry = get_registry()
+    if registry.exists():
+        version, path = registry.current()
+        if version:
+            return version, path
+    path = settings.REVIEW_MODEL_PATH
+    if os.path.exists(path):
+        return file_digest(path), path
+    return '', None
+
+
+def load_model(path=None):
+    """
+    Load the satisfaction model: ``path`` if given, else the registry's
+    current version, else REVIEW_MODEL_PATH.
+    Returns None when no artifact is available — scoring is optional.
+    """
+    global _current, _loaded, _manifest_mtime, _next_poll
+
+    _manifest_mtime = get_registry().manifest_mtime()
+    _next_poll = time.monotonic() + settings.REVIEW_MODEL_POLL_INTERVAL
+
+    current = LoadedModel(None, '')
+    try:
+        if path:
+            if os.path.exists(path):
+                current = LoadedModel(read_artifact(path), file_digest(path))
+        else:
+            version, artifact_path = _resolve_artifact()
+            if artifact_path:
+                current = LoadedModel(read_artifact(artifact_path), version)
+    except Exception as e:
+        logger.warning("Modèle non chargé: %s", e)
+
+    _current, _loaded = current, True
+    return current.model
+
+
+def _poll_registry():
+    """Swap in the registry's current version if the manifest changed."""
+    global _current, _manifest_mtime, _next_poll
+
+    if not _reload_lock.acquire(blocking=False):
+        return  # another thread is already reloading; keep serving the old model
+    try:
+        _next_poll = time.monotonic() + settings.REVIEW_MODEL_POLL_INTERVAL
+        registry = get_registry()
+        mtime = registry.manifest_mtime()
+        if mtime is None or mtime == _manifest_mtime:
+            return
+        _manifest_mtime = mtime
+
+        version, path = registry.current()
+        if not version or version == _current.version:
+            return
+        _current = LoadedModel(read_artifact(path), version)
+        logger.info("Satisfaction model %s loaded", version)
+    except Exception as e:
+        logger.error("Model reload failed, keeping %s: %s", _current.version or 'no model', e)
+    finally:
+        _reload_lock.release()
+
+
+def get_current():
+    """
+    Return the (model, version) pair to score with, loading it on first use
+    and picking up newly activated registry versions.
+    Read both from the same pair so they always match.
+    """
+    if not _loaded:
+        load_model()
+    elif time.monotonic() >= _next_poll:
+        _poll_registry()
+    return _current
+
+
+def get_model():
+    """Return the process-wide model (None when unavailable)."""
+    return get_current().model
+
+
+def request_reload(*args):
+    """Check the registry on the next get_current() call (SIGUSR2 handler)."""
+    global _next_poll
+    _next_poll = 0.0
+
+
+def freeze_for_fork():
+    """
+    Move every object allocated so far (model included) into the permanent
+    GC generation. Without this, the first collection in each worker writes
+    to the GC headers of the shared objects and un-shares their pages.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def memory_usage(pid='self'):
+    """
+    Return memory figures in kB for a process.
+
+    ``rss`` counts shared pages in full, ``pss`` splits them between the
+    processes sharing them, and ``private`` is what this process alone costs.
+    Falls back to the peak RSS from getrusage when /proc is unavailable.
+    """
+    fields = {'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'shared', 'Shared_Dirty': 'shared',
+              'Private_Clean': 'private', 'Private_Dirty': 'private'}
+    usage = {'pid': os.getpid() if pid == 'self' else pid}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in fields:
+                    key = fields[name]
+                    usage[key] = usage.get(key, 0) + int(value.split()[0])
+    except OSError:
+        usage['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage
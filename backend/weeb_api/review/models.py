@@ -5,7 +5,8 @@ class Review(models.Model):
     """
     Independent review model for contact form submissions.
     No user relationship - supports both authenticated and anonymous users.
-    Includes predicted satisfaction score from ML model.
+    Includes predicted satisfaction score from ML model, and an optional
+    verified satisfaction label used for incremental retraining.
     """
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
@@ -13,10 +14,17 @@ class Review(models.Model):
     phone = models.CharField(max_length=20, blank=True)
     message = models.TextField()
     predicted_satisfaction = models.IntegerField(null=True, blank=True)
+    satisfaction = models.IntegerField(null=True, blank=True)  # verified label (0/1), set by an admin
+    scoring_pending = models.BooleanField(default=False)  # queued for the background scorer
+    model_version = models.CharField(max_length=64, blank=True, db_index=True)  # model that produced predicted_satisfaction
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'review'
+        indexes = [
+            # Partial index: the scoring queue only ever looks at pending rows
+            models.Index(fields=['id'], condition=models.Q(scoring_pending=True), name='review_scoring_pending_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.created_at.strftime('%Y-%m-%d')}"
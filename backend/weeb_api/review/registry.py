@@ -0,0 +1,112 @@
+"""
+Versioned model registry.
+
+Artifacts live side by side in one directory, next to a manifest naming the
+active version:
+
+    models/
+        manifest.json   {"current": "v2", "versions": [{"version": "v1", ...}, ...]}
+        v1.pkl
+        v2.pkl
+
+Published artifacts are never modified; activating a version only rewrites
+the manifest, atomically (temporary file + os.replace), so a worker polling
+it never sees a half-written file. Workers pick the change up through
+review.ml.get_current().
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def file_digest(path):
+    """Short sha256 of a file, used as the version of unregistered artifacts."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()[:12]
+
+
+class ModelRegistry:
+    """Read and update a model registry directory."""
+
+    def __init__(self, root):
+        self.root = str(root)
+        self.manifest_path = os.path.join(self.root, MANIFEST_NAME)
+
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    def manifest_mtime(self):
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def read_manifest(self):
+        if not self.exists():
+            return {'current': None, 'versions': []}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        tmp_path = f'{self.manifest_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def get_version(self, version):
+        for entry in self.read_manifest()['versions']:
+            if entry['version'] == version:
+                return entry
+        raise KeyError(f'Unknown model version: {version}')
+
+    def current(self):
+        """Return (version, artifact path) of the active model, or (None, None)."""
+        manifest = self.read_manifest()
+        version = manifest.get('current')
+        if not version:
+            return None, None
+        entry = self.get_version(version)
+        return version, os.path.join(self.root, entry['file'])
+
+    def publish(self, artifact_path, version=None, activate=True, metadata=None):
+        """
+        Copy an artifact into the registry as a new immutable version.
+        The version defaults to the artifact's short sha256.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        version = version or file_digest(artifact_path)
+        manifest = self.read_manifest()
+        if any(entry['version'] == version for entry in manifest['versions']):
+            raise ValueError(f'Model version already published: {version}')
+
+        file_name = version + os.path.splitext(artifact_path)[1]
+        tmp_path = os.path.join(self.root, f'.{file_name}.tmp')
+        shutil.copyfile(artifact_path, tmp_path)
+        os.replace(tmp_path, os.path.join(self.root, file_name))
+
+        manifest['versions'].append({
+            'version': version,
+            'file': file_name,
+            'sha256': file_digest(os.path.join(self.root, file_name)),
+            'published_at': datetime.now(timezone.utc).isoformat(),
+            'metadata': metadata or {},
+        })
+        if activate:
+            manifest['current'] = version
+        self._write_manifest(manifest)
+        return version
+
+    def activate(self, version):
+        """Make an already published version the current one (deploy or rollback)."""
+        self.get_version(version)
+        manifest = self.read_manifest()
+        manifest['current'] = version
+        self._write_manifest(manifest)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Review
+from weeb_api.fastpath import DATETIME, Projection
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -17,6 +18,21 @@ class ReviewSerializer(serializers.ModelSerializer):
             'phone',
             'message',
             'predicted_satisfaction',
+            'model_version',
             'created_at',
         ]
-        read_only_fields = ['id', 'predicted_satisfaction', 'created_at']
+        read_only_fields = ['id', 'predicted_satisfaction', 'model_version', 'created_at']
+
+
+# Serializer-free twin of ReviewSerializer (API_FAST_READS)
+REVIEW_PROJECTION = Projection({
+    'id': 'id',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'email': 'email',
+    'phone': 'phone',
+    'message': 'message',
+    'predicted_satisfaction': 'predicted_satisfaction',
+    'model_version': 'model_version',
+    'created_at': ('created_at', DATETIME),
+})
@@ -0,0 +1,128 @@
+"""
+Background scoring jobs.
+
+Database-backed scoring queue:
+
+In deferred mode (REVIEW_SCORING_MODE = 'deferred') ReviewViewSet.create saves
+the review with ``scoring_pending=True`` and returns immediately. The
+``score_pending_reviews`` management command drains the queue in batches:
+one vectorized model call and one ``bulk_update`` per batch. The review table
+itself is the queue, so no external broker is needed. A batch the model fails
+on is retried one review at a time, once the model has scored PROBE_MESSAGE;
+reviews that still fail leave the queue unscored (``predicted_satisfaction``
+stays NULL, see rescore_range) so they cannot block the rows behind them.
+
+Bulk rescoring (``rescore_reviews`` command): rescore_range() refreshes the
+predictions of a primary-key range after a new model ships.
+"""
+import logging
+
+from django.db import connection, transaction
+
+from .ml import get_current
+from .models import Review
+from .scoring import PredictionCache, score_messages
+
+
+logger = logging.getLogger(__name__)
+
+# Any working model scores this; when it cannot, the model is broken, not the rows
+PROBE_MESSAGE = 'Article très intéressant, merci pour le partage.'
+
+
+def score_one_by_one(model, reviews):
+    """
+    Scores of a batch the model failed on, one review at a time; None for
+    the reviews that fail alone. The model is first checked on PROBE_MESSAGE
+    (past the prediction cache): if that fails too, the error propagates and
+    the reviews stay queued, whatever the size of the batch.
+    """
+    score_messages(model, [PROBE_MESSAGE], cache=PredictionCache(0))
+    scores = []
+    for review in reviews:
+        try:
+            scores.append(score_messages(model, [review.message])[0])
+        except Exception as e:
+            logger.error("Prediction error on review %s, left unscored: %s", review.pk, e)
+            scores.append(None)
+    return scores
+
+
+def score_pending_batch(batch_size=100):
+    """
+    Score up to ``batch_size`` pending reviews, oldest first.
+    Returns the number of reviews taken off the queue (scored or failed).
+
+    Rows are locked with SKIP LOCKED where the database supports it, so
+    several workers can drain the queue concurrently without overlapping.
+    """
+    model, model_version = get_current()
+    if model is None:
+        return 0
+
+    with transaction.atomic():
+        queryset = Review.objects.filter(scoring_pending=True).order_by('pk').only('id', 'message')
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        reviews = list(queryset[:batch_size])
+        if not reviews:
+            return 0
+
+        try:
+            scores = score_messages(model, [review.message for review in reviews])
+        except Exception as e:
+            logger.warning("Prediction error on a batch of %s reviews, scoring them one by one: %s", len(reviews), e)
+            scores = score_one_by_one(model, reviews)
+        for review, score in zip(reviews, scores):
+            if score is not None:
+                review.predicted_satisfaction = score[0]
+                review.model_version = model_version
+            review.scoring_pending = False
+
+        Review.objects.bulk_update(reviews, ['predicted_satisfaction', 'model_version', 'scoring_pending'])
+
+    return len(reviews)
+
+
+def drain_pending_reviews(batch_size=100):
+    """Score pending reviews batch after batch until the queue is empty."""
+    total = 0
+    while True:
+        try:
+            scored = score_pending_batch(batch_size)
+        except Exception as e:
+            logger.error("Prediction error: %s", e)
+            break
+        total += scored
+        if scored < batch_size:
+            break
+    return total
+
+
+def rescore_range(start, end, only_stale=False):
+    """
+    Rescore the reviews with ``start < pk <= end`` using the current model,
+    in one model call and one ``bulk_update``. Returns the number of rows.
+
+    With ``only_stale``, reviews already scored by the current version are
+    skipped. Bypasses the prediction cache: a full pass would only evict
+    the entries live traffic relies on.
+    """
+    model, model_version = get_current()
+    if model is None:
+        return 0
+
+    queryset = Review.objects.filter(pk__gt=start, pk__lte=end).exclude(message='').only('id', 'message')
+    if only_stale:
+        queryset = queryset.exclude(model_version=model_version)
+    reviews = list(queryset.order_by('pk'))
+    if not reviews:
+        return 0
+
+    scores = score_messages(model, [review.message for review in reviews], cache=PredictionCache(0))
+    for review, (prediction, _) in zip(reviews, scores):
+        review.predicted_satisfaction = prediction
+        review.model_version = model_version
+
+    Review.objects.bulk_update(reviews, ['predicted_satisfaction', 'model_version'])
+    return len(reviews)
@@ -1,3 +1,589 @@
-from django.test import TestCase
+import json
+import pickle
+from io import StringIO
 
-# Create your tests here.
+import joblib
+import numpy as np
+import pytest
+from django.urls import reverse
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from sklearn.pipeline import make_pipeline
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import LinearSVC
+from sklearn.naive_bayes import MultinomialNB
+
+from review import ml
+from review.linear import LinearScorer, export_linear_model
+from review.models import Review
+from review.training import train_incremental
+from review.scoring import PredictionCache, score_messages
+
+
+TRAINING_MESSAGES = [
+    'Service excellent, je suis très satisfait.',
+    'Super équipe, réponse rapide et efficace.',
+    'Très bonne expérience, merci beaucoup.',
+    'Erreurs fréquentes, très agaçant.',
+    'Impossible d\'accéder à mon compte.',
+    'Support lent et inutile, très déçu.',
+]
+TRAINING_LABELS = [1, 1, 1, 0, 0, 0]
+
+
+def train_pipeline(classifier):
+    pipeline = make_pipeline(TfidfVectorizer(ngram_range=(1, 2)), classifier)
+    pipeline.fit(TRAINING_MESSAGES, TRAINING_LABELS)
+    return pipeline
+
+
+def use_model(monkeypatch, model, version='test'):
+    """Serve ``model`` from review.ml without touching the disk"""
+    monkeypatch.setattr(ml, '_current', ml.LoadedModel(model, version))
+    monkeypatch.setattr(ml, '_loaded', True)
+    monkeypatch.setattr(ml, '_next_poll', float('inf'))
+
+
+@pytest.mark.django_db
+class TestPredictBatch:
+    """Test batched satisfaction scoring"""
+
+    def setup_method(self):
+        """Setup test client and a small trained model"""
+        self.client = APIClient()
+        self.predict_url = reverse('predict')
+        self.batch_url = reverse('predict-batch')
+        self.model = train_pipeline(LogisticRegression())
+
+    @pytest.fixture(autouse=True)
+    def patch_model(self, monkeypatch):
+        use_model(monkeypatch, self.model)
+
+    def test_batch_matches_single_predictions(self):
+        """Test that each batch item equals the single-message prediction"""
+        messages = ['Service excellent, merci.', 'Très déçu, support inutile.']
+
+        response = self.client.post(self.batch_url, {'messages': messages}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        predictions = response.json()['predictions']
+        assert len(predictions) == len(messages)
+        for message, item in zip(messages, predictions):
+            single = self.client.post(self.predict_url, {'features': message}, format='json').json()
+            assert item == single
+
+    def test_batch_rejects_non_list(self):
+        """Test that messages must be a list of strings"""
+        response = self.client.post(self.batch_url, {'messages': 'not a list'}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @override_settings(REVIEW_PREDICT_MAX_BATCH_SIZE=2)
+    def test_batch_rejects_oversized_batch(self):
+        """Test that batches above the configured max size are refused"""
+        response = self.client.post(self.batch_url, {'messages': ['a', 'b', 'c']}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'max 2' in response.json()['error']
+
+    def test_scoring_without_predict_proba(self):
+        """Test that LinearSVC models are scored through their decision function"""
+        model = train_pipeline(LinearSVC())
+
+        scores = score_messages(model, TRAINING_MESSAGES)
+
+        assert [prediction for prediction, _ in scores] == TRAINING_LABELS
+        assert all(0.5 <= confidence <= 1 for _, confidence in scores)
+
+
+class CountingModel:
+    """Wraps a pipeline and counts the messages sent to it"""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.scored = 0
+
+    def predict_proba(self, messages):
+        self.scored += len(messages)
+        return self.pipeline.predict_proba(messages)
+
+
+class TestPredictionCache:
+    """Test the LRU prediction cache"""
+
+    def setup_method(self):
+        self.model = CountingModel(train_pipeline(LogisticRegression()))
+        self.cache = PredictionCache(max_size=2)
+
+    def test_near_identical_messages_hit_cache(self):
+        """Test that case, spacing and punctuation variants share one entry"""
+        first = score_messages(self.model, ['Service excellent, merci !'], cache=self.cache)
+        second = score_messages(self.model, ['  service EXCELLENT merci'], cache=self.cache)
+
+        assert first == second
+        assert self.model.scored == 1
+        assert self.cache.stats()['hits'] == 1
+        assert self.cache.stats()['misses'] == 1
+
+    def test_only_misses_are_scored(self):
+        """Test that a batch only sends uncached messages to the model"""
+        score_messages(self.model, ['Très déçu.'], cache=self.cache)
+        score_messages(self.model, ['Très déçu.', 'Service excellent.'], cache=self.cache)
+
+        assert self.model.scored == 2
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        for message in ['un message', 'deux messages', 'un message', 'trois messages']:
+            score_messages(self.model, [message], cache=self.cache)
+
+        assert self.cache.stats()['size'] == 2
+        score_messages(self.model, ['un message'], cache=self.cache)
+        assert self.model.scored == 3
+        score_messages(self.model, ['deux messages'], cache=self.cache)
+        assert self.model.scored == 4
+
+    def test_new_model_invalidates_cache(self):
+        """Test that swapping the model empties the cache"""
+        score_messages(self.model, ['Très déçu.'], cache=self.cache)
+        other = CountingModel(train_pipeline(LogisticRegression(C=0.1)))
+
+        score_messages(other, ['Très déçu.'], cache=self.cache)
+
+        assert other.scored == 1
+        assert self.cache.stats()['size'] == 1
+
+
+@pytest.mark.django_db
+class TestReviewCreate:
+    """Test review creation with inline scoring"""
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.review_url = reverse('review-list')
+        self.data = {
+            'first_name': 'Julie',
+            'last_name': 'Robert',
+            'email': 'julie.robert@example.com',
+            'message': 'Erreurs fréquentes, très agaçant.',
+        }
+
+    @pytest.fixture(autouse=True)
+    def patch_model(self, monkeypatch):
+        use_model(monkeypatch, train_pipeline(LogisticRegression()))
+
+    def test_create_scores_review(self):
+        """Test that a created review gets the same score as /predict"""
+        response = self.client.post(self.review_url, self.data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        expected = self.client.post(reverse('predict'), {'features': self.data['message']}, format='json')
+        review = Review.objects.get(pk=response.data['results']['id'])
+        assert review.predicted_satisfaction == expected.json()['prediction']
+        assert review.model_version == 'test'
+        assert review.scoring_pending is False
+
+    @override_settings(REVIEW_SCORING_MODE='deferred')
+    def test_deferred_create_queues_review(self):
+        """Test that deferred mode saves without scoring"""
+        response = self.client.post(self.review_url, self.data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['results']['predicted_satisfaction'] is None
+        assert Review.objects.get(pk=response.data['results']['id']).scoring_pending is True
+
+    @override_settings(REVIEW_SCORING_MODE='deferred')
+    def test_worker_drains_pending_reviews(self):
+        """Test that the worker scores every pending review in batches"""
+        messages = ['Erreurs fréquentes, très agaçant.', 'Service excellent, merci.', 'Très déçu.']
+        for message in messages:
+            self.client.post(self.review_url, {**self.data, 'message': message}, format='json')
+
+        call_command('score_pending_reviews', batch_size=2, stdout=StringIO())
+
+        reviews = Review.objects.order_by('pk')
+        assert not reviews.filter(scoring_pending=True).exists()
+        expected = score_messages(ml.get_model(), messages)
+        assert [review.predicted_satisfaction for review in reviews] == [p for p, _ in expected]
+        assert {review.model_version for review in reviews} == {'test'}
+
+    @override_settings(REVIEW_SCORING_MODE='deferred')
+    def test_worker_skips_review_breaking_the_model(self, monkeypatch):
+        """Test that one review the model fails on does not block the queue"""
+        class FragileModel:
+            def __init__(self, model):
+                self.model = model
+
+            def predict_proba(self, messages):
+                if any('BOOM' in message for message in messages):
+                    raise ValueError('cannot score this message')
+                return self.model.predict_proba(messages)
+
+        use_model(monkeypatch, FragileModel(train_pipeline(LogisticRegression())))
+        messages = ['BOOM', 'Service excellent, merci.', 'Très déçu.', 'Erreurs fréquentes, très agaçant.']
+        for message in messages:
+            self.client.post(self.review_url, {**self.data, 'message': message}, format='json')
+
+        call_command('score_pending_reviews', batch_size=2, stdout=StringIO())
+
+        reviews = list(Review.objects.order_by('pk'))
+        assert not any(review.scoring_pending for review in reviews)
+        assert reviews[0].predicted_satisfaction is None and reviews[0].model_version == ''
+        assert all(review.predicted_satisfaction is not None for review in reviews[1:])
+
+    @override_settings(REVIEW_SCORING_MODE='deferred')
+    def test_broken_model_leaves_queue_intact(self, monkeypatch):
+        """Test that a model failing on every review keeps them queued"""
+        class BrokenModel:
+            def predict_proba(self, messages):
+                raise ValueError('model is broken')
+
+        use_model(monkeypatch, BrokenModel())
+        for message in ['Service excellent, merci.', 'Très déçu.']:
+            self.client.post(self.review_url, {**self.data, 'message': message}, format='json')
+
+        call_command('score_pending_reviews', batch_size=2, stdout=StringIO())
+
+        assert Review.objects.filter(scoring_pending=True).count() == 2
+
+    @override_settings(REVIEW_SCORING_MODE='deferred')
+    def test_broken_model_keeps_single_reviews_queued(self, monkeypatch):
+        """Test that batches of one review tell a broken model from a bad row"""
+        class BrokenModel:
+            def predict_proba(self, messages):
+                raise ValueError('model is broken')
+
+        use_model(monkeypatch, BrokenModel())
+        self.client.post(self.review_url, {**self.data, 'message': 'Service excellent, merci.'}, format='json')
+
+        call_command('score_pending_reviews', batch_size=1, stdout=StringIO())
+
+        assert Review.objects.filter(scoring_pending=True).count() == 1
+
+    @override_settings(REVIEW_SCORING_MODE='deferred')
+    def test_single_bad_review_leaves_queue(self, monkeypatch):
+        """Test that a lone review breaking a working model is taken off the queue"""
+        class FragileModel:
+            def __init__(self, model):
+                self.model = model
+
+            def predict_proba(self, messages):
+                if any('BOOM' in message for message in messages):
+                    raise ValueError('cannot score this message')
+                return self.model.predict_proba(messages)
+
+        use_model(monkeypatch, FragileModel(train_pipeline(LogisticRegression())))
+        for message in ['BOOM', 'Service excellent, merci.']:
+            self.client.post(self.review_url, {**self.data, 'message': message}, format='json')
+
+        call_command('score_pending_reviews', batch_size=1, stdout=StringIO())
+
+        reviews = list(Review.objects.order_by('pk'))
+        assert not any(review.scoring_pending for review in reviews)
+        assert reviews[0].predicted_satisfaction is None
+        assert reviews[1].predicted_satisfaction is not None
+
+
+class TestLinearScorer:
+    """Test the compiled linear scorer against the sklearn pipeline"""
+
+    MESSAGES = TRAINING_MESSAGES + ['Service rapide mais compte inaccessible.', 'Rien à voir.', '']
+
+    def test_logistic_probabilities_match_pipeline(self, tmp_path):
+        """Test that predict_proba is reproduced within float32 tolerance"""
+        pipeline = train_pipeline(LogisticRegression())
+        export_linear_model(pipeline, tmp_path / 'model.npz')
+
+        scorer = LinearScorer(tmp_path / 'model.npz')
+
+        np.testing.assert_allclose(scorer.predict_proba(self.MESSAGES), pipeline.predict_proba(self.MESSAGES), atol=1e-5)
+        assert list(scorer.predict(self.MESSAGES)) == list(pipeline.predict(self.MESSAGES))
+
+    def test_svm_decision_matches_pipeline(self, tmp_path):
+        """Test that LinearSVC is exported without predict_proba"""
+        pipeline = train_pipeline(LinearSVC())
+        export_linear_model(pipeline, tmp_path / 'model.npz')
+
+        scorer = ml.read_artifact(str(tmp_path / 'model.npz'))
+
+        assert isinstance(scorer, LinearScorer)
+        assert not hasattr(scorer, 'predict_proba')
+        np.testing.assert_allclose(scorer.decision_function(self.MESSAGES), pipeline.decision_function(self.MESSAGES), atol=1e-5)
+        assert score_messages(scorer, self.MESSAGES, cache=PredictionCache(0)) == \
+            score_messages(pipeline, self.MESSAGES, cache=PredictionCache(0))
+
+    def test_unsupported_classifier_refused(self, tmp_path):
+        """Test that non-linear pipelines cannot be exported"""
+        with pytest.raises(ValueError):
+            export_linear_model(train_pipeline(MultinomialNB()), tmp_path / 'model.npz')
+
+
+@pytest.mark.django_db
+class TestIncrementalTraining:
+    """Test incremental retraining from labelled reviews"""
+
+    @pytest.fixture(autouse=True)
+    def registry_dir(self, settings, tmp_path):
+        settings.REVIEW_MODEL_REGISTRY_DIR = str(tmp_path / 'registry')
+
+    def add_reviews(self, messages, labels):
+        for message, label in zip(messages, labels):
+            Review.objects.create(
+                first_name='Test', last_name='User', email='test@example.com',
+                message=message, satisfaction=label
+            )
+
+    def test_only_new_reviews_are_trained(self):
+        """Test that a second run resumes after the last trained review"""
+        self.add_reviews(TRAINING_MESSAGES, TRAINING_LABELS)
+        Review.objects.create(first_name='No', last_name='Label', email='n@example.com', message='Sans étiquette')
+
+        model, last_id, rows = train_incremental(chunk_size=4)
+        assert rows == len(TRAINING_MESSAGES)
+        assert last_id == Review.objects.filter(satisfaction__isnull=False).latest('pk').pk
+
+        self.add_reviews(TRAINING_MESSAGES[:2], TRAINING_LABELS[:2])
+        _, _, rows = train_incremental(model, since_id=last_id, chunk_size=4)
+        assert rows == 2
+
+    def test_command_publishes_and_resumes(self):
+        """Test that the command publishes versions and skips when nothing is new"""
+        self.add_reviews(TRAINING_MESSAGES, TRAINING_LABELS)
+        call_command('train_incremental', stdout=StringIO())
+
+        registry = ml.get_registry()
+        manifest = registry.read_manifest()
+        assert manifest['versions'][-1]['metadata']['rows'] == len(TRAINING_MESSAGES)
+        model = ml.read_artifact(registry.current()[1])
+        assert score_messages(model, TRAINING_MESSAGES, cache=PredictionCache(0))
+
+        out = StringIO()
+        call_command('train_incremental', stdout=out)
+        assert 'No new labelled reviews' in out.getvalue()
+        assert len(registry.read_manifest()['versions']) == 1
+
+
+@pytest.mark.django_db
+class TestRescoreReviews:
+    """Test the bulk rescoring command"""
+
+    @pytest.fixture(autouse=True)
+    def setup_reviews(self, monkeypatch, tmp_path):
+        use_model(monkeypatch, train_pipeline(LogisticRegression()), version='v2')
+        self.checkpoint = str(tmp_path / 'checkpoint.json')
+        self.reviews = [
+            Review.objects.create(
+                first_name='Test', last_name='User', email='test@example.com',
+                message=message, predicted_satisfaction=1 - label, model_version='v1'
+            )
+            for message, label in zip(TRAINING_MESSAGES, TRAINING_LABELS)
+        ]
+
+    def rescore(self, **options):
+        out = StringIO()
+        call_command('rescore_reviews', checkpoint=self.checkpoint, chunk_size=4, stdout=out, **options)
+        return out.getvalue()
+
+    def test_rescore_all_reviews(self):
+        """Test that every review is rescored with the current model"""
+        out = self.rescore()
+
+        assert 'Rescored 6 review(s)' in out
+        assert 'rows/s' in out
+        reviews = Review.objects.order_by('pk')
+        expected = score_messages(ml.get_model(), TRAINING_MESSAGES, cache=PredictionCache(0))
+        assert [review.predicted_satisfaction for review in reviews] == [p for p, _ in expected]
+        assert {review.model_version for review in reviews} == {'v2'}
+
+    def test_resume_from_checkpoint(self):
+        """Test that --resume skips the chunks already done"""
+        with open(self.checkpoint, 'w') as f:
+            json.dump({'model_version': 'v2', 'last_id': self.reviews[3].pk}, f)
+
+        out = self.rescore(resume=True)
+
+        assert 'Rescored 2 review(s)' in out
+        assert Review.objects.filter(model_version='v1').count() == 4
+
+    def test_only_stale_reviews(self):
+        """Test that --only-stale skips reviews scored by the current version"""
+        Review.objects.filter(pk__in=[r.pk for r in self.reviews[:5]]).update(model_version='v2')
+
+        out = self.rescore(only_stale=True)
+
+        assert 'Rescored 1 review(s)' in out
+
+
+class TestModelLoading:
+    """Test the process-wide model loader"""
+
+    @pytest.fixture(autouse=True)
+    def restore_model(self, monkeypatch, settings, tmp_path):
+        settings.REVIEW_MODEL_REGISTRY_DIR = str(tmp_path / 'registry')
+        monkeypatch.setattr(ml, '_current', ml.LoadedModel(None, ''))
+        monkeypatch.setattr(ml, '_loaded', False)
+
+    def test_load_pickle_artifact(self, tmp_path):
+        """Test that the pickle from train_model.py is loaded once"""
+        path = tmp_path / 'model.pkl'
+        with open(path, 'wb') as f:
+            pickle.dump(train_pipeline(LogisticRegression()), f)
+
+        model = ml.load_model(str(path))
+
+        assert ml.get_model() is model
+        assert score_messages(model, TRAINING_MESSAGES)
+
+    def test_load_joblib_artifact_memory_mapped(self, tmp_path):
+        """Test that .joblib artifacts are memory-mapped"""
+        path = tmp_path / 'model.joblib'
+        joblib.dump(train_pipeline(LogisticRegression()), path)
+
+        model = ml.load_model(str(path))
+
+        assert isinstance(model[-1].coef_, np.memmap)
+        assert score_messages(model, TRAINING_MESSAGES)
+
+    def test_missing_artifact_disables_scoring(self, tmp_path):
+        """Test that a missing artifact leaves the model unset"""
+        assert ml.load_model(str(tmp_path / 'missing.pkl')) is None
+        assert ml.get_model() is None
+
+    def test_memory_usage_reports_rss(self):
+        """Test that memory usage reports at least the RSS"""
+        usage = ml.memory_usage()
+
+        assert usage['rss'] > 0
+
+    def test_registry_hot_swap(self, tmp_path):
+        """Test that activating a new registry version swaps the model in place"""
+        first, second = tmp_path / 'first.pkl', tmp_path / 'second.pkl'
+        for path, classifier in [(first, LogisticRegression()), (second, LinearSVC())]:
+            with open(path, 'wb') as f:
+                pickle.dump(train_pipeline(classifier), f)
+        registry = ml.get_registry()
+        registry.publish(str(first), version='v1')
+
+        assert ml.get_current().version == 'v1'
+        old_model = ml.get_model()
+
+        registry.publish(str(second), version='v2')
+        ml.request_reload()
+
+        assert ml.get_current().version == 'v2'
+        assert ml.get_model() is not old_model
+
+        registry.activate('v1')
+        ml.request_reload()
+
+        assert ml.get_current().version == 'v1'
+
+    def test_registry_rejects_duplicate_version(self, tmp_path):
+        """Test that published versions are immutable"""
+        path = tmp_path / 'model.pkl'
+        with open(path, 'wb') as f:
+            pickle.dump(train_pipeline(LogisticRegression()), f)
+        registry = ml.get_registry()
+        registry.publish(str(path), version='v1')
+
+        with pytest.raises(ValueError):
+            registry.publish(str(path), version='v1')
+
+
+class TestBenchmarkInference:
+    """Test the benchmark_inference command and its regression gate"""
+
+    @pytest.fixture(autouse=True)
+    def tiny_benchmark(self, monkeypatch, settings, tmp_path):
+        from review.management.commands import benchmark_inference
+
+        settings.REVIEW_MODEL_REGISTRY_DIR = str(tmp_path / 'registry')
+        monkeypatch.setattr(ml, '_current', ml.LoadedModel(None, ''))
+        monkeypatch.setattr(ml, '_loaded', False)
+        monkeypatch.setattr(benchmark_inference, 'dataset_messages', lambda: TRAINING_MESSAGES)
+        self.artifact = str(tmp_path / 'model.pkl')
+        with open(self.artifact, 'wb') as f:
+            pickle.dump(train_pipeline(LogisticRegression()), f)
+        self.output = tmp_path / 'results.json'
+
+    def run(self, **options):
+        # 4 passes over 6 messages: enough samples for the gate (MIN_SAMPLES_TO_COMPARE)
+        call_command('benchmark_inference', artifact=self.artifact, output=str(self.output), repeat=4,
+                     stdout=StringIO(), **options)
+        with open(self.output) as f:
+            return json.load(f)
+
+    def baseline(self, results, factor, tmp_path):
+        """The results with every p95 multiplied by ``factor``, as a baseline file"""
+        results = json.loads(json.dumps(results))
+        for stats in results['scenarios'].values():
+            stats['p95'] *= factor
+        path = tmp_path / 'baseline.json'
+        path.write_text(json.dumps(results))
+        return str(path)
+
+    def test_results_written_as_json(self):
+        results = self.run()
+
+        assert results['model'] == 'Pipeline'
+        assert {'cold.load_ms', 'single.warm', 'batch.100', 'length.5000', 'endpoint.concurrency_4'} <= set(results['scenarios'])
+        assert results['scenarios']['single.warm']['samples'] == 4 * len(TRAINING_MESSAGES)
+
+    def test_output_path_required(self):
+        from django.core.management.base import CommandError
+
+        with pytest.raises(CommandError):
+            call_command('benchmark_inference', artifact=self.artifact, stdout=StringIO())
+
+    def test_baseline_gate(self, tmp_path):
+        from django.core.management.base import CommandError
+
+        results = self.run()
+
+        self.run(baseline=self.baseline(results, 1000, tmp_path))
+        with pytest.raises(CommandError, match='Latency regressions'):
+            self.run(baseline=self.baseline(results, 1e-6, tmp_path))
+
+
+@pytest.mark.django_db
+class TestReviewExport:
+    """Test the admin-only streaming review export"""
+
+    def setup_method(self):
+        from django.contrib.auth import get_user_model
+
+        self.client = APIClient()
+        self.export_url = reverse('review-export')
+        self.admin_user = get_user_model().objects.create_user(
+            email='admin@example.com', first_name='Admin', last_name='User', password='password123',
+            is_active=True, is_staff=True
+        )
+        for i in range(3):
+            Review.objects.create(
+                first_name='Test', last_name='User', email=f'test{i}@example.com',
+                message=f'Message {i}', predicted_satisfaction=i % 2, model_version='v1'
+            )
+
+    def test_ndjson(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.export_url)
+
+        assert response.streaming
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        assert [row['email'] for row in rows] == ['test0@example.com', 'test1@example.com', 'test2@example.com']
+        assert rows[1]['predicted_satisfaction'] == 1
+        assert rows[1]['satisfaction'] is None
+
+    def test_csv(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(self.export_url, {'output': 'csv'})
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0].startswith('id,first_name,last_name,email')
+        assert len(lines) == 4
+
+    def test_admin_only(self):
+        assert self.client.get(self.export_url).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,70 @@
+"""
+Incremental retraining from the review table.
+
+train_model.py refits TF-IDF from scratch on the static CSV. Here the model
+is a HashingVectorizer (fixed-size feature space, no vocabulary to refit)
+followed by an SGDClassifier with logistic loss, which supports
+``partial_fit``. Labelled reviews are streamed out of the database in
+primary-key order with ``.iterator()``, one chunk at a time, so memory stays
+bounded and each run only pays for the rows added since the previous one.
+
+The resulting pipeline has predict_proba, so it is scored like the models
+from train_model.py once published to the registry.
+"""
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+
+from .models import Review
+
+
+CLASSES = [0, 1]
+DEFAULT_N_FEATURES = 2 ** 18
+
+
+def build_incremental_model(n_features=DEFAULT_N_FEATURES):
+    """Untrained hashing + SGD pipeline."""
+    return make_pipeline(
+        HashingVectorizer(ngram_range=(1, 2), n_features=n_features, alternate_sign=False),
+        SGDClassifier(loss='log_loss', random_state=42),
+    )
+
+
+def labelled_chunks(since_id=0, chunk_size=1000):
+    """
+    Yield (last_id, messages, labels) chunks of labelled reviews with a
+    primary key above ``since_id``, oldest first.
+    """
+    rows = (
+        Review.objects
+        .filter(pk__gt=since_id, satisfaction__isnull=False)
+        .order_by('pk')
+        .values_list('pk', 'message', 'satisfaction')
+        .iterator(chunk_size=chunk_size)
+    )
+    messages, labels, last_id = [], [], since_id
+    for pk, message, satisfaction in rows:
+        messages.append(message)
+        labels.append(satisfaction)
+        last_id = pk
+        if len(messages) == chunk_size:
+            yield last_id, messages, labels
+            messages, labels = [], []
+    if messages:
+        yield last_id, messages, labels
+
+
+def train_incremental(model=None, since_id=0, chunk_size=1000):
+    """
+    Update ``model`` (or a fresh one) with the labelled reviews newer than
+    ``since_id``. Returns (model, last_review_id, rows_seen).
+    """
+    model = model if model is not None else build_incremental_model()
+    vectorizer, classifier = model[0], model[-1]
+
+    last_id, rows = since_id, 0
+    for last_id, messages, labels in labelled_chunks(since_id, chunk_size):
+        classifier.partial_fit(vectorizer.transform(messages), labels, classes=CLASSES)
+        rows += len(messages)
+
+    return model, last_id, rows
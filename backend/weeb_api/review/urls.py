@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import ReviewViewSet
-from .views import predict
+from .views import predict, predict_batch
 
 # Router configuration for review endpoints
 router = DefaultRouter()
@@ -9,5 +9,6 @@ router.register(r'review', ReviewViewSet, basename='review')
 
 urlpatterns = [
     path('', include(router.urls)),
-    path('predict/', predict)
+    path('predict/', predict, name='predict'),
+    path('predict/batch/', predict_batch, name='predict-batch')
 ]
@@ -2,26 +2,38 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
 from .models import Review
-from .serializers import ReviewSerializer
-import os
+from .serializers import ReviewSerializer, REVIEW_PROJECTION
+from .scoring import score_messages
+from .ml import get_current, get_model
 import json
-import pickle
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.renderers import BrowsableAPIRenderer
+from weeb_api.renderers import FastJSONRenderer
+from weeb_api.export import export_response
 
 
+REVIEW_EXPORT_FIELDS = [
+    'id', 'first_name', 'last_name', 'email', 'phone', 'message',
+    'predicted_satisfaction', 'satisfaction', 'model_version', 'created_at',
+]
+
 
 class ReviewViewSet(viewsets.ModelViewSet):
     """
     ViewSet for handling contact form submissions.
-    Automatically predicts satisfaction score using ML model.
+    Automatically predicts satisfaction score using ML model,
+    inline or through the background scoring queue (REVIEW_SCORING_MODE).
     Public can create reviews (contact form).
     Only admins can list/view/delete reviews.
+    GET /api/review/export/ streams every review as NDJSON or CSV (?output=, admin only).
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     pagination_class = None  # Disable pagination to show all reviews
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     
     def get_permissions(self):
         """
@@ -34,6 +46,17 @@ class ReviewViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    def list(self, request, *args, **kwargs):
+        if not settings.API_FAST_READS:
+            return super().list(request, *args, **kwargs)
+        # Same JSON as ReviewSerializer, built from .values() rows
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(REVIEW_PROJECTION.render(REVIEW_PROJECTION.values(queryset)))
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        return export_response(request, Review.objects.order_by('id'), REVIEW_EXPORT_FIELDS, 'reviews')
+
     def create(self, request, *args, **kwargs):
         # Validate data
         serializer = self.get_serializer(data=request.data)
@@ -42,15 +65,23 @@ class ReviewViewSet(viewsets.ModelViewSet):
         # Predict satisfaction from message
         message = request.data.get('message', '')
         predicted_satisfaction = None
+
+        # Deferred mode: save now, the score_pending_reviews worker scores it later
+        deferred = settings.REVIEW_SCORING_MODE == 'deferred'
+        model, model_version = (None, '') if deferred else get_current()
         
         if model and message:
             try:
-                predicted_satisfaction = int(model.predict([message])[0])
+                predicted_satisfaction, _ = score_messages(model, [message])[0]
             except Exception as e:
                 print(f"Prediction error: {e}")
         
         # Save review with prediction
-        review = serializer.save(predicted_satisfaction=predicted_satisfaction)
+        review = serializer.save(
+            predicted_satisfaction=predicted_satisfaction,
+            model_version=model_version if predicted_satisfaction is not None else '',
+            scoring_pending=deferred and bool(message)
+        )
         
         return Response({
             'success': True,
@@ -59,18 +90,6 @@ class ReviewViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_201_CREATED)
         
 
-# Chargement du modèle (optionnel)
-model = None
-try:
-    MODEL_PATH = os.path.join(os.path.dirname(__file__), "../../weeb_api_model.pkl")
-    if os.path.exists(MODEL_PATH):
-        with open(MODEL_PATH, "rb") as f:
-            model = pickle.load(f)
-except Exception as e:
-    print(f"Modèle non chargé: {e}")
-    model = None
-
-
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -84,11 +103,9 @@ def predict(request):
 
             features = body["features"]  
 
-            proba = model.predict_proba([features])[0]
-            # Seuil abaissé à 0.4 : si proba insatisfaction >= 0.4 → négatif
-            prediction = 0 if proba[0] >= 0.4 else 1
+            prediction, confidence = score_messages(get_model(), [features])[0]
 
-            return JsonResponse({"prediction": int(prediction), "confidence": round(float(max(proba)), 2)})
+            return JsonResponse({"prediction": prediction, "confidence": confidence})
 
         except Exception as e:
 
@@ -96,7 +113,42 @@ def predict(request):
 
     return JsonResponse({"message": "Send a POST request with features."})
 
-        
-
-
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def predict_batch(request):
+    """
+    POST /api/predict/batch/
+    Score a list of messages in a single model call.
+    Body: {"messages": ["...", "..."]}
+    """
+    try:
+        body = json.loads(request.body)
+        messages = body["messages"]
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+        return JsonResponse({"error": "messages must be a list of strings."}, status=400)
+
+    max_batch_size = settings.REVIEW_PREDICT_MAX_BATCH_SIZE
+    if len(messages) > max_batch_size:
+        return JsonResponse({
+            "error": f"Batch too large: {len(messages)} messages (max {max_batch_size})."
+        }, status=400)
+
+    model = get_model()
+    if model is None:
+        return JsonResponse({"error": "Model not loaded."}, status=503)
+
+    try:
+        scores = score_messages(model, messages)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    return JsonResponse({
+        "predictions": [
+            {"prediction": prediction, "confidence": confidence}
+            for prediction, confidence in scores
+        ]
+    })
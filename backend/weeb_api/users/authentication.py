@@ -0,0 +1,102 @@
+"""
+Claims-only JWT authentication (opt-in with JWT_CLAIMS_AUTHENTICATION).
+
+JWTAuthentication loads the User row on every authenticated request.
+ClaimsJWTAuthentication instead builds a ClaimsUser from the access token's
+claims (see CustomTokenObtainPairSerializer.get_token), which is enough for
+read-only views and permission checks; group names still come from
+users.roles so membership changes apply immediately. Views that need the
+model (e.g. to set it as a foreign key) call ``model_user(request.user)``,
+fetched once per request, and kept for JWT_CLAIMS_USER_CACHE_TTL seconds when
+JWT_CLAIMS_USER_CACHE names a cache shared by every worker (a per-process
+locmem cache would only be cleared in the worker that saved the user).
+
+is_active and is_staff are read from the access token. A refresh re-reads
+the User row (CustomTokenRefreshSerializer) and refuses inactive users, so
+deactivating a user or removing staff status takes effect when their access
+token expires (ACCESS_TOKEN_LIFETIME). Tokens issued before these claims
+existed fall back to the database lookup.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+from weeb_api.caches import shared_cache
+
+
+User = get_user_model()
+
+# Claims a token needs to be served without the database
+USER_CLAIMS = ('email', 'first_name', 'last_name', 'is_staff', 'is_active', 'date_joined')
+
+
+def cache_key(user_id):
+    return f'users:instance:{user_id}'
+
+
+def instance_cache():
+    """The cross-request cache, or None when JWT_CLAIMS_USER_CACHE is unset or not shared"""
+    return shared_cache(settings.JWT_CLAIMS_USER_CACHE)
+
+
+class ClaimsUser(TokenUser):
+    """request.user built from the access token's claims"""
+
+    @cached_property
+    def is_active(self):
+        return self.token['is_active']
+
+    @cached_property
+    def date_joined(self):
+        return parse_datetime(self.token['date_joined'])
+
+    @cached_property
+    def instance(self):
+        """The User row, from the short-lived shared cache or one query"""
+        cache = instance_cache()
+        user = cache.get(cache_key(self.pk)) if cache is not None else None
+        if user is None:
+            try:
+                user = User.objects.get(pk=self.pk)
+            except User.DoesNotExist:
+                raise AuthenticationFailed('User not found', code='user_not_found')
+            if cache is not None:
+                cache.set(cache_key(self.pk), user, settings.JWT_CLAIMS_USER_CACHE_TTL)
+        return user
+
+    def __eq__(self, other):
+        if isinstance(other, User):
+            return self.pk == other.pk
+        return super().__eq__(other)
+
+    __hash__ = TokenUser.__hash__
+
+
+def model_user(user):
+    """The User instance behind request.user, whichever authentication class built it"""
+    return user.instance if isinstance(user, ClaimsUser) else user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication without the per-request User lookup"""
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+        user = ClaimsUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_user_instance(sender, instance, **kwargs):
+    cache = instance_cache()
+    if cache is not None:
+        cache.delete(cache_key(instance.pk))
@@ -0,0 +1,213 @@
+"""
+In-memory negative lookup in front of the refresh-token blacklist.
+
+With ROTATE_REFRESH_TOKENS and BLACKLIST_AFTER_ROTATION every refresh
+blacklists the token it consumed, so token_blacklist keeps growing while the
+common case of a check is "not blacklisted". A Bloom filter of blacklisted
+jtis answers that case without the database; a hit (blacklisted, or one of
+BLACKLIST_FILTER_ERROR_RATE false positives) is confirmed with the usual query.
+
+The filter is only used when BLACKLIST_FILTER_CACHE names a cache shared by
+every worker (redis, memcached, database...); otherwise, as by default, every
+check queries the table. It is built from the table on first use, then kept
+up to date:
+- rows blacklisted by this process are added when they are saved
+- on commit, every process bumps a generation in the shared cache and
+  publishes the blacklisted jti under it; a changed generation makes the next
+  check add the jtis published since its last sync. Ids do not commit in
+  order, so reading "rows above the last id seen" could skip a row committed
+  late; a published jti cannot be skipped
+- when jtis are missing (evicted, published after the bump was seen) or too
+  many were published since the last sync, the filter is rebuilt instead
+- every BLACKLIST_FILTER_SYNC_INTERVAL seconds the rows above the last id seen
+  are read anyway, in case a bump was lost (process killed before it)
+- past twice its capacity it is rebuilt, dropping the flushed expired tokens
+
+A per-process cache (locmem) does not qualify: a token blacklisted by another
+worker, on logout or rotation, would be accepted until the next sync.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from weeb_api.caches import shared_cache
+
+
+GENERATION_KEY = 'users:blacklist:generation'
+REBUILD_CHUNK_SIZE = 5000
+# Published jtis read in one sync; further behind, rebuilding is cheaper
+MAX_PUBLISHED_GAP = 1000
+# Published jtis outlive any sync interval; an evicted one only costs a rebuild
+PUBLISHED_TTL = 24 * 3600
+
+
+def published_key(generation):
+    return f'users:blacklist:jti:{generation}'
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: two 64-bit halves of one digest give every position
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class BlacklistFilter:
+    def __init__(self, capacity, error_rate, sync_interval, cache_alias):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.cache_alias = cache_alias
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Forget everything; the next check rebuilds from the table"""
+        self._bloom = None
+        self._watermark = 0
+        self._generation = None
+        self._next_sync = 0
+
+    @property
+    def enabled(self):
+        """Whether the generation cache is shared, without which the filter can miss other workers' rows"""
+        return shared_cache(self.cache_alias) is not None
+
+    def might_contain(self, jti):
+        """False means the jti is certainly not blacklisted"""
+        self._sync()
+        return jti in self._bloom
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def changed(self, jti):
+        """Publish a blacklisted jti to the other processes (once its row is committed)"""
+        cache = shared_cache(self.cache_alias)
+        if cache is None:
+            return
+        cache.add(GENERATION_KEY, 0, None)
+        try:
+            generation = cache.incr(GENERATION_KEY)
+        except ValueError:
+            # Evicted between add() and incr(); readers see the generation go back and rebuild
+            generation = 1
+            cache.set(GENERATION_KEY, generation, None)
+        cache.set(published_key(generation), jti, PUBLISHED_TTL)
+
+    def _sync(self):
+        cache = shared_cache(self.cache_alias)
+        generation = cache.get(GENERATION_KEY)
+        if self._bloom is not None and generation == self._generation and time.monotonic() < self._next_sync:
+            return
+        with self._lock:
+            if self._bloom is None or self._bloom.count > 2 * self._bloom.capacity:
+                self._rebuild()
+            elif not self._add_published(cache, generation):
+                self._rebuild()
+            else:
+                self._read_above(self._watermark, self._bloom)
+            self._generation = generation
+            self._next_sync = time.monotonic() + self.sync_interval
+
+    def _add_published(self, cache, generation):
+        """Add the jtis published since the last sync; False when some cannot be read"""
+        previous, generation = self._generation or 0, generation or 0
+        if generation == previous:
+            return True
+        if not 0 < generation - previous <= MAX_PUBLISHED_GAP:
+            return False
+        keys = [published_key(g) for g in range(previous + 1, generation + 1)]
+        jtis = cache.get_many(keys)
+        if len(jtis) < len(keys):
+            return False
+        for jti in jtis.values():
+            self._bloom.add(jti)
+        return True
+
+    def _rebuild(self):
+        total = BlacklistedToken.objects.count()
+        bloom = BloomFilter(max(self.capacity, 2 * total), self.error_rate)
+        self._watermark = 0
+        self._read_above(0, bloom)
+        self._bloom = bloom
+
+    def _read_above(self, watermark, bloom):
+        rows = (
+            BlacklistedToken.objects.filter(pk__gt=watermark).order_by('pk')
+            .values_list('pk', 'token__jti').iterator(chunk_size=REBUILD_CHUNK_SIZE)
+        )
+        for pk, jti in rows:
+            bloom.add(jti)
+            self._watermark = pk
+
+
+blacklist_filter = BlacklistFilter(
+    settings.BLACKLIST_FILTER_CAPACITY,
+    settings.BLACKLIST_FILTER_ERROR_RATE,
+    settings.BLACKLIST_FILTER_SYNC_INTERVAL,
+    settings.BLACKLIST_FILTER_CACHE,
+)
+
+
+class FilteredRefreshToken(tokens.RefreshToken):
+    """
+    RefreshToken whose blacklist check and insert skip the database for tokens
+    not in the filter (when it is enabled)
+    """
+
+    def check_blacklist(self):
+        if not blacklist_filter.enabled or blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if not blacklist_filter.enabled or blacklist_filter.might_contain(jti):
+            return super().blacklist()
+
+        token, _ = OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={'token': str(self), 'expires_at': datetime_from_epoch(self.payload['exp'])},
+        )
+        # Not in the filter: no row yet, unless a concurrent request just wrote it
+        try:
+            with transaction.atomic():
+                return BlacklistedToken.objects.create(token=token), True
+        except IntegrityError:
+            return BlacklistedToken.objects.get(token=token), False
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_blacklisted_token(sender, instance, created, **kwargs):
+    if created:
+        jti = instance.token.jti
+        blacklist_filter.add(jti)
+        transaction.on_commit(lambda: blacklist_filter.changed(jti))
@@ -0,0 +1,37 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+BOOLEANS = {'true': True, '1': True, 'false': False, '0': False}
+
+
+class UserFilterBackend(BaseFilterBackend):
+    """
+    Server-side filters for GET /api/users/:
+    - ?is_active=true|false, ?is_staff=true|false
+    - ?group=<id or name>
+
+    The newest-first pages are served by the users indexes on (date_joined, id)
+    and (is_active, date_joined, id).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+
+        for name in ['is_active', 'is_staff']:
+            if params.get(name):
+                value = BOOLEANS.get(params[name].lower())
+                if value is None:
+                    errors[name] = 'Must be true or false.'
+                else:
+                    queryset = queryset.filter(**{name: value})
+
+        group = params.get('group', '').strip()
+        if group:
+            lookup = 'groups__id' if group.isdigit() else 'groups__name'
+            queryset = queryset.filter(**{lookup: group})
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
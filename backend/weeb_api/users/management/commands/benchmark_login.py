@@ -0,0 +1,113 @@
+import json
+
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from review.benchmarks import percentiles, time_calls
+from users.blacklist import FilteredRefreshToken
+from users.models import User
+from users.serializers import CustomTokenObtainPairSerializer
+from weeb_api.fastpath import DATETIME
+
+
+class Rollback(Exception):
+    pass
+
+
+class OriginalLoginSerializer(TokenObtainPairSerializer):
+    """The login pipeline before the single-query one, for comparison"""
+    token_class = FilteredRefreshToken
+
+    def validate(self, attrs):
+        user = User.objects.filter(email=attrs.get('email')).first()
+        if user and not user.is_active:
+            raise serializers.ValidationError('Inactive account.')
+        data = super().validate(attrs)
+        data['user'] = {
+            'id': self.user.id,
+            'email': self.user.email,
+            'first_name': self.user.first_name,
+            'last_name': self.user.last_name,
+            'is_staff': self.user.is_staff,
+            'is_active': self.user.is_active,
+            'groups': list(self.user.groups.values_list('name', flat=True)),
+        }
+        return data
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['email'] = user.email
+        token['first_name'] = user.first_name
+        token['last_name'] = user.last_name
+        token['is_staff'] = user.is_staff
+        token['is_active'] = user.is_active
+        token['date_joined'] = DATETIME(user.date_joined)
+        token['groups'] = list(user.groups.values_list('name', flat=True))
+        return token
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare logins/sec and queries per login of the original login pipeline and the '
+        'single-query one (POST /api/auth/login/), on a seeded user rolled back afterwards'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help='Logins per pipeline')
+        parser.add_argument('--fast-hasher', action='store_true',
+                            help='Hash with MD5 to measure the pipeline without the PBKDF2 cost')
+
+    def handle(self, *args, **options):
+        hashers = ['django.contrib.auth.hashers.MD5PasswordHasher'] if options['fast_hasher'] else None
+        overrides = {'ALLOWED_HOSTS': ['testserver']}
+        if hashers:
+            overrides['PASSWORD_HASHERS'] = hashers
+        try:
+            with override_settings(**overrides), transaction.atomic():
+                self.seed()
+                self.run(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self):
+        user = User.objects.create_user(email='bench-login@example.com', first_name='Bench', last_name='Login',
+                                        password='bench-password', is_active=True)
+        for name in ['Moderators', 'Bench readers']:
+            user.groups.add(Group.objects.get_or_create(name=name)[0])
+
+    def run(self, repeat):
+        factory = RequestFactory()
+        body = json.dumps({'email': 'bench-login@example.com', 'password': 'bench-password'})
+        pipelines = [
+            ('original', TokenObtainPairView.as_view(serializer_class=OriginalLoginSerializer)),
+            ('single-query', TokenObtainPairView.as_view(serializer_class=CustomTokenObtainPairSerializer)),
+        ]
+
+        def login(view):
+            response = view(factory.post('/api/auth/login/', body, content_type='application/json'))
+            if response.status_code != 200:
+                raise CommandError(f'Login answered {response.status_code}')
+
+        self.stdout.write(f"{'Pipeline':<14} {'Queries':>8} {'p50 ms':>9} {'p95 ms':>9} {'Logins/s':>10}")
+        self.stdout.write('-' * 54)
+        rates = {}
+        for name, view in pipelines:
+            login(view)  # warm up, and the first last_login write
+            with CaptureQueriesContext(connection) as queries:
+                login(view)
+            stats = percentiles(time_calls(login, [view], repeat))
+            rates[name] = 1e6 / stats['mean']
+            self.stdout.write(
+                f"{name:<14} {len(queries):>8} {stats['p50'] / 1000:>9.2f} {stats['p95'] / 1000:>9.2f} {rates[name]:>10.1f}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"single-query: {rates['single-query'] / rates['original']:.2f}x the original logins/sec"
+        ))
@@ -81,6 +81,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     class Meta:
         db_table = 'users' #the table name in the DB
+        indexes = [
+            # Admin user list: newest first (UserPagination), optionally by is_active
+            models.Index(fields=['-date_joined', '-id'], name='user_joined_id_idx'),
+            models.Index(fields=['is_active', '-date_joined', '-id'], name='user_active_joined_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
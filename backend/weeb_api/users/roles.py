@@ -0,0 +1,141 @@
+"""
+Group-based roles of a user, resolved once per request.
+
+The group names are memoised on the user instance (request.user lives as long
+as the request). When USER_ROLES_CACHE names a cache shared by every worker
+(redis, memcached, database...), they are also kept across requests for
+USER_ROLES_CACHE_TTL seconds. Membership changes (m2m_changed on User.groups,
+from either side), group renames/deletions and user creation/deletion drop the
+cached entries. A per-process cache (locmem) is never used: a change would only
+be dropped from the worker that made it, so it is one query per request then.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models import Aggregate, CharField, Value
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from weeb_api.caches import shared_cache
+
+
+User = get_user_model()
+
+MODERATORS_GROUP = 'Moderators'
+
+# ASCII unit separator: cannot appear in a group name typed in the admin
+GROUP_SEPARATOR = '\x1f'
+
+
+def cache_key(user_id):
+    return f'users:roles:{user_id}'
+
+
+def roles_cache():
+    """The cross-request cache, or None when USER_ROLES_CACHE is unset or not shared"""
+    return shared_cache(settings.USER_ROLES_CACHE)
+
+
+def group_names(user):
+    """Names of the user's groups: request memo, then prefetch, then cache, then one query"""
+    if user.pk is None:
+        return []
+    names = getattr(user, '_group_names', None)
+    if names is not None:
+        return names
+
+    prefetched = (getattr(user, '_prefetched_objects_cache', None) or {}).get('groups')
+    if prefetched is not None:
+        names = [group.name for group in prefetched]
+    else:
+        cache = roles_cache()
+        names = cache.get(cache_key(user.pk)) if cache is not None else None
+        if names is None:
+            # By id rather than user.groups: also serves claims-only users (users.authentication)
+            names = list(Group.objects.filter(user__pk=user.pk).values_list('name', flat=True))
+            if cache is not None:
+                cache.set(cache_key(user.pk), names, settings.USER_ROLES_CACHE_TTL)
+    user._group_names = names
+    return names
+
+
+class GroupNames(Aggregate):
+    """
+    A user's group names joined with GROUP_SEPARATOR (NULL without groups), to
+    load them in the same query as the user: ``annotate(group_list=GroupNames('groups__name'))``
+    """
+    function = 'GROUP_CONCAT'
+    output_field = CharField()
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, Value(GROUP_SEPARATOR), **extra)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='STRING_AGG', **extra_context)
+
+
+def split_group_names(value):
+    return value.split(GROUP_SEPARATOR) if value else []
+
+
+def prime(user, names):
+    """Store group names already fetched elsewhere (e.g. annotated on the login query)"""
+    user._group_names = list(names)
+    cache = roles_cache()
+    if cache is not None:
+        cache.set(cache_key(user.pk), user._group_names, settings.USER_ROLES_CACHE_TTL)
+
+
+def is_moderator(user):
+    return user.is_authenticated and MODERATORS_GROUP in group_names(user)
+
+
+def is_moderator_or_admin(user):
+    """Admins (is_staff) and members of the 'Moderators' group can edit any article"""
+    return user.is_staff or is_moderator(user)
+
+
+def forget(user_ids):
+    cache = roles_cache()
+    if cache is not None:
+        cache.delete_many([cache_key(user_id) for user_id in user_ids])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def forget_changed_memberships(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # group.user_set.clear(): pk_set is not given, collect the members first
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        instance.__dict__.pop('_group_names', None)
+        forget([instance.pk])
+    elif action == 'post_clear':
+        forget(instance.__dict__.pop('_cleared_user_ids', []))
+    else:
+        forget(pk_set)
+
+
+@receiver(post_save, sender=Group)
+def forget_renamed_group(sender, instance, created, **kwargs):
+    if not created:
+        forget(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Group)
+def forget_deleted_group(sender, instance, **kwargs):
+    forget(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User)
+def forget_new_user(sender, instance, created, **kwargs):
+    # Primary keys can be reused: a new user must not inherit a deleted one's roles
+    if created:
+        forget([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    forget([instance.pk])
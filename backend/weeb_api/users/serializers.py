@@ -1,7 +1,18 @@
-from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from datetime import timedelta
+
+from rest_framework import exceptions, serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import Group
+from django.contrib.auth.signals import user_login_failed
 from django.contrib.auth.password_validation import validate_password
+from django.utils import timezone
+from weeb_api.fastpath import DATETIME
 from .models import User
+from .blacklist import FilteredRefreshToken
+from .roles import GroupNames, group_names, prime, split_group_names
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -15,8 +26,16 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'date_joined', 'is_active', 'is_staff']
     
     def get_groups(self, obj):
-        """Return list of group names the user belongs to"""
-        return list(obj.groups.values_list('name', flat=True))
+        """Return list of group names the user belongs to (prefetched or from the role cache)"""
+        return group_names(obj)
+
+
+def group_names_by_user(user_ids):
+    """{user_id: [group names]} in one query, for the serializer-free read path (weeb_api.fastpath)"""
+    names = {}
+    for user_id, name in Group.objects.filter(user__in=user_ids).values_list('user', 'name'):
+        names.setdefault(user_id, []).append(name)
+    return names
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -71,49 +90,165 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
+def record_login(user):
+    """update_last_login(), skipped when the stored value is recent (coalesces bursts of logins)"""
+    now = timezone.now()
+    if user.last_login and now - user.last_login < timedelta(seconds=settings.LOGIN_LAST_LOGIN_RESOLUTION):
+        return
+    # queryset.update(): no post_save, which would drop the user's cached entries
+    User.objects.filter(pk=user.pk).update(last_login=now)
+    user.last_login = now
+
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Custom JWT token serializer that:
     1. Refuses login for inactive users
     2. Adds custom claims to the token payload
+    
+    With the default AUTHENTICATION_BACKENDS (ModelBackend only), the password
+    is checked here, as ModelBackend would: the user and their group names are
+    loaded in one query, reused for the token claims and the response body,
+    and failures still send user_login_failed. Any other backend list goes
+    through authenticate(). last_login is only written when older than
+    LOGIN_LAST_LOGIN_RESOLUTION seconds.
     """
+    token_class = FilteredRefreshToken
     
     def validate(self, attrs):
-        # Get user before calling parent validate
-        user = User.objects.filter(email=attrs.get('email')).first()
-        
-        # Check if user exists and is active
-        if user and not user.is_active:
-            raise serializers.ValidationError(
-                'Votre compte est inactif. Veuillez contacter un administrateur pour l\'activation.'
+        if list(settings.AUTHENTICATION_BACKENDS) == [MODEL_BACKEND]:
+            user = self.check_credentials(attrs)
+        else:
+            user = authenticate(self.context.get('request'), email=attrs['email'], password=attrs['password'])
+            if user is not None and not user.is_active:
+                self.inactive()
+        if user is None:
+            raise exceptions.AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
             )
         
-        # Call parent validate to get tokens
-        data = super().validate(attrs)
+        self.user = user
+        
+        refresh = self.get_token(user)
+        data = {'refresh': str(refresh), 'access': str(refresh.access_token)}
+        
+        if api_settings.UPDATE_LAST_LOGIN:
+            record_login(user)
         
         # Add custom claims
         data['user'] = {
-            'id': self.user.id,
-            'email': self.user.email,
-            'first_name': self.user.first_name,
-            'last_name': self.user.last_name,
-            'is_staff': self.user.is_staff,
-            'is_active': self.user.is_active,
-            'groups': list(self.user.groups.values_list('name', flat=True))
+            'id': user.id,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_staff': user.is_staff,
+            'is_active': user.is_active,
+            'groups': group_names(user)
         }
         
         return data
     
+    def check_credentials(self, attrs):
+        """ModelBackend.authenticate() on the user + groups row; None when refused"""
+        # User + groups in one round trip (instead of authenticate() fetching the user again)
+        user = (
+            User.objects.filter(email=attrs.get('email'))
+            .annotate(group_list=GroupNames('groups__name'))
+            .first()
+        )
+        
+        # Check if user exists and is active
+        if user and not user.is_active:
+            self.login_failed(attrs)
+            self.inactive()
+        
+        if user is None:
+            # Hash anyway so unknown emails take as long as wrong passwords (as ModelBackend does)
+            User().set_password(attrs['password'])
+        if user is None or not user.check_password(attrs['password']):
+            self.login_failed(attrs)
+            return None
+        
+        prime(user, split_group_names(user.group_list))
+        return user
+    
+    def login_failed(self, attrs):
+        """The signal authenticate() sends (lockout and audit receivers), password masked as it does"""
+        user_login_failed.send(
+            sender='django.contrib.auth',
+            credentials={'email': attrs.get('email'), 'password': '********************'},
+            request=self.context.get('request'),
+        )
+    
+    def inactive(self):
+        raise serializers.ValidationError(
+            'Votre compte est inactif. Veuillez contacter un administrateur pour l\'activation.'
+        )
+    
     @classmethod
     def get_token(cls, user):
         """Add custom claims to token payload"""
         token = super().get_token(user)
+        add_user_claims(token, user)
+        return token
+
+
+def add_user_claims(token, user):
+    """The user's claims (see users.authentication), from the User row"""
+    token['email'] = user.email
+    token['first_name'] = user.first_name
+    token['last_name'] = user.last_name
+    token['is_staff'] = user.is_staff
+    token['is_active'] = user.is_active
+    token['date_joined'] = DATETIME(user.date_joined)
+    token['groups'] = group_names(user)
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh that:
+    1. Refuses deleted and inactive users
+    2. Re-issues the claims from the User row, so a removed staff status or
+       group is not carried over from the previous token
+    
+    The user and their group names are loaded in one query; the blacklist
+    check/insert go through the in-memory filter.
+    """
+    token_class = FilteredRefreshToken
+    default_error_messages = {
+        'no_active_account': 'No active account found for the given token.'
+    }
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
         
-        # Add custom claims
-        token['email'] = user.email
-        token['first_name'] = user.first_name
-        token['last_name'] = user.last_name
-        token['is_staff'] = user.is_staff
-        token['groups'] = list(user.groups.values_list('name', flat=True))
+        user = (
+            User.objects.filter(**{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)})
+            .annotate(group_list=GroupNames('groups__name'))
+            .first()
+        )
+        if user is None or not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
+        prime(user, split_group_names(user.group_list))
+        
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            # Before the claims change: the blacklist stores the token as it was issued
+            refresh.blacklist()
+        
+        add_user_claims(refresh, user)
+        data = {'access': str(refresh.access_token)}
         
-        return token
\ No newline at end of file
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        
+        return data
@@ -3,10 +3,33 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
 
 User = get_user_model()
 
 
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """A CACHES alias seen by every worker (file based, unlike locmem)"""
+    settings.CACHES = {**settings.CACHES, 'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': str(tmp_path),
+    }}
+    return 'shared'
+
+
+@pytest.fixture
+def shared_roles_cache(settings, shared_cache):
+    settings.USER_ROLES_CACHE = shared_cache
+
+
+@pytest.fixture
+def shared_blacklist_cache(monkeypatch, shared_cache):
+    from users.blacklist import blacklist_filter
+    
+    # The filter reads BLACKLIST_FILTER_CACHE once, at import
+    monkeypatch.setattr(blacklist_filter, 'cache_alias', shared_cache)
+
+
 @pytest.mark.django_db
 class TestAuthentication:
     """Test authentication endpoints"""
@@ -132,3 +155,615 @@ class TestAuthentication:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['success'] is True
         assert response.data['user']['email'] == self.valid_user_data['email']
+
+
+@pytest.mark.django_db
+class TestUserList:
+    """Test the admin user list"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.users_url = reverse('user-list')
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            first_name='Admin',
+            last_name='User',
+            password='password123',
+            is_active=True,
+            is_staff=True
+        )
+        moderators, _ = Group.objects.get_or_create(name='Moderators')
+        for i in range(10):
+            user = User.objects.create_user(
+                email=f'user{i}@example.com',
+                first_name='User',
+                last_name=f'Number{i}',
+                password='password123'
+            )
+            user.groups.add(moderators)
+    
+    def test_list_prefetches_groups(self, django_assert_num_queries):
+        """One page of users + one prefetch of their groups, whatever the number of users"""
+        self.client.force_authenticate(user=self.admin_user)
+        
+        with django_assert_num_queries(2):
+            response = self.client.get(self.users_url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 11
+        assert sum(u['groups'] == ['Moderators'] for u in response.data['results']) == 10
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_roles_cache')
+class TestRoleCache:
+    """Test the per-request and cross-request cache of group names"""
+    
+    def setup_method(self):
+        self.moderators, _ = Group.objects.get_or_create(name='Moderators')
+        self.user = User.objects.create_user(
+            email='member@example.com', first_name='Member', last_name='User', password='password123', is_active=True
+        )
+    
+    def fresh(self, user):
+        """A new instance, as request.user is on every request"""
+        return User.objects.get(pk=user.pk)
+    
+    def test_roles_resolved_once_per_request_and_cached_across(self, django_assert_num_queries):
+        from users.roles import is_moderator_or_admin
+        
+        self.user.groups.add(self.moderators)
+        user = self.fresh(self.user)
+        with django_assert_num_queries(1):
+            assert is_moderator_or_admin(user)
+            assert is_moderator_or_admin(user)
+        
+        next_request_user = self.fresh(self.user)
+        with django_assert_num_queries(0):
+            assert is_moderator_or_admin(next_request_user)
+    
+    @pytest.mark.parametrize('alias', ['', 'default'])
+    def test_no_cross_request_cache_unless_shared(self, settings, alias, django_assert_num_queries):
+        """Unset or per-process (locmem): another worker could keep roles that were revoked"""
+        from users.roles import is_moderator_or_admin, roles_cache
+        
+        settings.USER_ROLES_CACHE = alias
+        assert roles_cache() is None
+        self.user.groups.add(self.moderators)
+        user = self.fresh(self.user)
+        with django_assert_num_queries(1):
+            assert is_moderator_or_admin(user)
+            assert is_moderator_or_admin(user)
+        
+        next_request_user = self.fresh(self.user)
+        with django_assert_num_queries(1):
+            assert is_moderator_or_admin(next_request_user)
+    
+    def test_membership_changes_invalidate(self):
+        from users.roles import group_names
+        
+        assert group_names(self.fresh(self.user)) == []
+        self.user.groups.add(self.moderators)
+        assert group_names(self.fresh(self.user)) == ['Moderators']
+        
+        self.moderators.user_set.remove(self.user)
+        assert group_names(self.fresh(self.user)) == []
+        
+        self.moderators.user_set.add(self.user)
+        assert group_names(self.fresh(self.user)) == ['Moderators']
+        self.moderators.user_set.clear()
+        assert group_names(self.fresh(self.user)) == []
+    
+    def test_group_rename_and_delete_invalidate(self):
+        from users.roles import group_names
+        
+        self.user.groups.add(self.moderators)
+        assert group_names(self.fresh(self.user)) == ['Moderators']
+        
+        self.moderators.name = 'Editors'
+        self.moderators.save()
+        assert group_names(self.fresh(self.user)) == ['Editors']
+        
+        self.moderators.delete()
+        assert group_names(self.fresh(self.user)) == []
+    
+    def test_reused_primary_key_does_not_inherit_roles(self):
+        from users.roles import group_names
+        
+        self.user.groups.add(self.moderators)
+        assert group_names(self.fresh(self.user)) == ['Moderators']
+        pk = self.user.pk
+        self.user.delete()
+        
+        newcomer = User.objects.create_user(
+            email='newcomer@example.com', first_name='New', last_name='Comer', password='password123', pk=pk
+        )
+        assert group_names(self.fresh(newcomer)) == []
+    
+    def test_login_queries_groups_once(self):
+        """Token claims and the response's user share one lookup"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from users.roles import roles_cache
+        
+        self.user.groups.add(self.moderators)
+        roles_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().post(reverse('token_obtain_pair'), {
+                'email': 'member@example.com', 'password': 'password123'
+            })
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['user']['groups'] == ['Moderators']
+        assert sum('auth_group' in query['sql'] for query in queries.captured_queries) == 1
+
+
+@pytest.mark.django_db
+class TestClaimsAuthentication:
+    """Test the claims-only JWT authentication"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.me_url = reverse('me')
+        self.user = User.objects.create_user(
+            email='claims@example.com', first_name='Claims', last_name='User', password='password123', is_active=True
+        )
+        self.user.groups.add(Group.objects.get_or_create(name='Moderators')[0])
+    
+    def login(self):
+        response = self.client.post(reverse('token_obtain_pair'), {
+            'email': 'claims@example.com', 'password': 'password123'
+        })
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    
+    @pytest.mark.usefixtures('shared_roles_cache')
+    def test_me_served_without_database(self, monkeypatch, django_assert_num_queries):
+        from users.authentication import ClaimsJWTAuthentication
+        from users.serializers import UserSerializer
+        from users.views import me_view
+        
+        # What JWT_CLAIMS_AUTHENTICATION sets as the default authentication class
+        monkeypatch.setattr(me_view.cls, 'authentication_classes', [ClaimsJWTAuthentication])
+        self.login()
+        with django_assert_num_queries(0):
+            response = self.client.get(self.me_url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['user'] == UserSerializer(User.objects.get(pk=self.user.pk)).data
+    
+    def test_me_reads_the_database_by_default(self):
+        self.login()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        
+        assert self.client.get(self.me_url).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_token_without_claims_falls_back_to_database(self, monkeypatch):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from users.authentication import ClaimsJWTAuthentication
+        from users.views import me_view
+        
+        monkeypatch.setattr(me_view.cls, 'authentication_classes', [ClaimsJWTAuthentication])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        response = self.client.get(self.me_url)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['user']['email'] == 'claims@example.com'
+    
+    def test_inactive_claim_refused(self, monkeypatch):
+        from users.authentication import ClaimsJWTAuthentication
+        from users.serializers import CustomTokenObtainPairSerializer
+        from users.views import me_view
+        
+        monkeypatch.setattr(me_view.cls, 'authentication_classes', [ClaimsJWTAuthentication])
+        self.user.is_active = False
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        assert self.client.get(self.me_url).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_refresh_reissues_claims_from_database(self):
+        from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+        
+        self.user.is_staff = True
+        self.user.save()
+        refresh = self.client.post(reverse('token_obtain_pair'), {
+            'email': 'claims@example.com', 'password': 'password123'
+        }).data['refresh']
+        assert RefreshToken(refresh)['is_staff'] is True
+        
+        self.user.is_staff = False
+        self.user.save()
+        self.user.groups.clear()
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh})
+        
+        assert response.status_code == status.HTTP_200_OK
+        for token in [AccessToken(response.data['access']), RefreshToken(response.data['refresh'])]:
+            assert token['is_staff'] is False
+            assert token['groups'] == []
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        assert self.client.get(reverse('user-list')).status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_refresh_refused_for_inactive_or_deleted_user(self):
+        refresh = self.client.post(reverse('token_obtain_pair'), {
+            'email': 'claims@example.com', 'password': 'password123'
+        }).data['refresh']
+        
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        assert self.client.post(reverse('token_refresh'), {'refresh': refresh}).status_code == status.HTTP_401_UNAUTHORIZED
+        
+        self.user.delete()
+        assert self.client.post(reverse('token_refresh'), {'refresh': refresh}).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    @pytest.mark.parametrize('alias', ['', 'default'])
+    def test_model_user_read_per_request_unless_cache_shared(self, settings, alias, django_assert_num_queries):
+        """Unset or per-process (locmem): a save in another worker would not clear the copy"""
+        from users.authentication import ClaimsUser, instance_cache, model_user
+        from users.serializers import CustomTokenObtainPairSerializer
+        
+        settings.JWT_CLAIMS_USER_CACHE = alias
+        assert instance_cache() is None
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        with django_assert_num_queries(1):
+            user = ClaimsUser(token)
+            assert model_user(user) == self.user
+            assert model_user(user) is model_user(user)
+        with django_assert_num_queries(1):
+            model_user(ClaimsUser(token))
+    
+    def test_model_user_shared_cache_cleared_on_save(self, settings, shared_cache, django_assert_num_queries):
+        from users.authentication import ClaimsUser, model_user
+        from users.serializers import CustomTokenObtainPairSerializer
+        
+        settings.JWT_CLAIMS_USER_CACHE = shared_cache
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        model_user(ClaimsUser(token))
+        with django_assert_num_queries(0):
+            assert model_user(ClaimsUser(token)).first_name == 'Claims'
+        
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        assert model_user(ClaimsUser(token)).first_name == 'Renamed'
+    
+    def test_writes_use_the_model_user(self, monkeypatch):
+        from blog.models import Article, Category
+        from blog.views import BlogViewSet
+        from users.authentication import ClaimsJWTAuthentication
+        
+        monkeypatch.setattr(BlogViewSet, 'authentication_classes', [ClaimsJWTAuthentication])
+        self.user.groups.clear()
+        other = User.objects.create_user(
+            email='other@example.com', first_name='Other', last_name='User', password='password123', is_active=True
+        )
+        category = Category.objects.create(name='Tech')
+        foreign = Article.objects.create(title='Not mine', content='Some content', author=other, category=category)
+        self.login()
+        
+        response = self.client.post(reverse('article-list'), {
+            'title': 'Claims article', 'content': 'Written with a claims user', 'category_id': category.id
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        article = Article.objects.get(title='Claims article')
+        assert article.author == self.user
+        
+        url = reverse('article-detail', kwargs={'pk': article.pk})
+        assert self.client.patch(url, {'title': 'Claims article edited'}).status_code == status.HTTP_200_OK
+        url = reverse('article-detail', kwargs={'pk': foreign.pk})
+        assert self.client.patch(url, {'title': 'Hijacked'}).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestBlacklistFilter:
+    """Test the in-memory filter in front of the refresh-token blacklist"""
+    
+    def setup_method(self):
+        from users.blacklist import blacklist_filter
+        
+        blacklist_filter.clear()
+        self.client = APIClient()
+        self.refresh_url = reverse('token_refresh')
+        self.logout_url = reverse('logout')
+        User.objects.create_user(
+            email='tokens@example.com', first_name='Tokens', last_name='User', password='password123', is_active=True
+        )
+        response = self.client.post(reverse('token_obtain_pair'), {
+            'email': 'tokens@example.com', 'password': 'password123'
+        })
+        self.access, self.refresh = response.data['access'], response.data['refresh']
+    
+    def blacklist_reads(self, queries):
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and 'token_blacklist_blacklistedtoken' in query['sql']
+        ]
+    
+    def test_bloom_filter_has_no_false_negatives(self):
+        from users.blacklist import BloomFilter
+        
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+        
+        assert all(f'jti-{i}' in bloom for i in range(1000))
+        assert sum(f'other-{i}' in bloom for i in range(10000)) < 300
+    
+    @pytest.mark.usefixtures('shared_blacklist_cache')
+    def test_refresh_skips_blacklist_reads(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from users.blacklist import blacklist_filter
+        
+        blacklist_filter.might_contain('warm-up')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.refresh_url, {'refresh': self.refresh})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert self.blacklist_reads(queries) == []
+    
+    def test_rotated_token_is_refused(self):
+        response = self.client.post(self.refresh_url, {'refresh': self.refresh})
+        assert response.status_code == status.HTTP_200_OK
+        
+        assert self.client.post(self.refresh_url, {'refresh': self.refresh}).status_code == status.HTTP_401_UNAUTHORIZED
+        assert self.client.post(self.refresh_url, {'refresh': response.data['refresh']}).status_code == status.HTTP_200_OK
+    
+    def test_logged_out_token_is_refused(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        assert self.client.post(self.logout_url, {'refresh_token': self.refresh}).status_code == status.HTTP_200_OK
+        assert self.client.post(self.logout_url, {'refresh_token': self.refresh}).status_code == status.HTTP_400_BAD_REQUEST
+        assert self.client.post(self.refresh_url, {'refresh': self.refresh}).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    @pytest.mark.usefixtures('shared_blacklist_cache')
+    def test_blacklisting_by_another_process_is_seen(self):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from users.blacklist import blacklist_filter
+        
+        blacklist_filter.might_contain('warm-up')
+        # Written without post_save, as another worker's insert looks from here
+        jti = RefreshToken(self.refresh)['jti']
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=OutstandingToken.objects.get(jti=jti))])
+        blacklist_filter.changed(jti)
+        
+        assert self.client.post(self.refresh_url, {'refresh': self.refresh}).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def blacklist_elsewhere(self, refresh, pk):
+        """Another worker's commit: no post_save here, only what it publishes"""
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from users.blacklist import blacklist_filter
+        
+        jti = RefreshToken(refresh)['jti']
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(pk=pk, token=OutstandingToken.objects.get(jti=jti))])
+        blacklist_filter.changed(jti)
+    
+    def out_of_order(self, before_late_check=None):
+        """Worker A takes id 10, worker B id 11 and commits first; then A commits"""
+        from users.blacklist import blacklist_filter
+        
+        late = self.client.post(reverse('token_obtain_pair'), {
+            'email': 'tokens@example.com', 'password': 'password123'
+        }).data['refresh']
+        blacklist_filter.might_contain('warm-up')
+        
+        self.blacklist_elsewhere(self.refresh, 11)
+        assert self.client.post(self.refresh_url, {'refresh': self.refresh}).status_code == status.HTTP_401_UNAUTHORIZED
+        self.blacklist_elsewhere(late, 10)
+        if before_late_check:
+            before_late_check()
+        
+        assert self.client.post(self.refresh_url, {'refresh': late}).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    @pytest.mark.usefixtures('shared_blacklist_cache')
+    def test_rows_committed_out_of_id_order_are_seen(self):
+        """Reading above the last id seen would skip id 10 (PostgreSQL ids do not commit in order)"""
+        self.out_of_order()
+    
+    @pytest.mark.usefixtures('shared_blacklist_cache')
+    def test_missing_published_jti_rebuilds(self):
+        from django.core.cache import caches
+        from users.blacklist import GENERATION_KEY, blacklist_filter, published_key
+        
+        def evict():
+            cache = caches[blacklist_filter.cache_alias]
+            cache.delete(published_key(cache.get(GENERATION_KEY)))
+        
+        self.out_of_order(evict)
+    
+    @pytest.mark.parametrize('alias', ['', 'default'])
+    def test_database_checked_unless_cache_shared(self, monkeypatch, alias):
+        """Unset or per-process (locmem): the generation bump would not reach this worker"""
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from users.blacklist import blacklist_filter
+        
+        monkeypatch.setattr(blacklist_filter, 'cache_alias', alias)
+        assert not blacklist_filter.enabled
+        # Another worker blacklists the token (no post_save here, its cache is not ours)
+        jti = RefreshToken(self.refresh)['jti']
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=OutstandingToken.objects.get(jti=jti))])
+        
+        assert self.client.post(self.refresh_url, {'refresh': self.refresh}).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestLoginPipeline:
+    """Test the single-query login"""
+    
+    def setup_method(self):
+        self.client = APIClient()
+        self.login_url = reverse('token_obtain_pair')
+        self.user = User.objects.create_user(
+            email='pipeline@example.com', first_name='Pipe', last_name='Line', password='password123', is_active=True
+        )
+        self.user.groups.add(Group.objects.get_or_create(name='Moderators')[0], Group.objects.create(name='Readers, Writers'))
+    
+    def login(self, password='password123', email='pipeline@example.com'):
+        return self.client.post(self.login_url, {'email': email, 'password': password})
+    
+    def test_login_queries(self, django_assert_num_queries):
+        # User + groups, the outstanding token, last_login
+        with django_assert_num_queries(3):
+            response = self.login()
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(response.data['user']['groups']) == ['Moderators', 'Readers, Writers']
+        
+        # last_login is recent: not written again
+        last_login = User.objects.get(pk=self.user.pk).last_login
+        with django_assert_num_queries(2):
+            assert self.login().status_code == status.HTTP_200_OK
+        assert last_login is not None
+        assert User.objects.get(pk=self.user.pk).last_login == last_login
+    
+    @pytest.mark.usefixtures('shared_roles_cache')
+    def test_token_claims_and_role_cache_share_the_login_query(self, django_assert_num_queries):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from users.roles import group_names
+        
+        response = self.login()
+        token = AccessToken(response.data['access'])
+        assert sorted(token['groups']) == ['Moderators', 'Readers, Writers']
+        
+        with django_assert_num_queries(0):
+            assert sorted(group_names(User(pk=self.user.pk))) == ['Moderators', 'Readers, Writers']
+    
+    def test_user_without_groups(self):
+        self.user.groups.clear()
+        
+        response = self.login()
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['user']['groups'] == []
+    
+    def test_wrong_credentials_refused(self):
+        assert self.login(password='wrong-password').status_code == status.HTTP_401_UNAUTHORIZED
+        assert self.login(email='nobody@example.com').status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_failures_send_user_login_failed(self):
+        """Lockout and audit receivers see the same signal as with authenticate()"""
+        from django.contrib.auth.signals import user_login_failed
+        
+        failures = []
+        
+        def receiver(sender, credentials, request, **kwargs):
+            failures.append(credentials)
+        
+        user_login_failed.connect(receiver)
+        try:
+            self.login(password='wrong-password')
+            self.login(email='nobody@example.com')
+            self.login()
+        finally:
+            user_login_failed.disconnect(receiver)
+        
+        assert [c['email'] for c in failures] == ['pipeline@example.com', 'nobody@example.com']
+        assert all(c['password'] != 'wrong-password' for c in failures)
+    
+    def test_other_backends_go_through_authenticate(self, settings):
+        """The single-query path only stands in for ModelBackend"""
+        settings.AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.RemoteUserBackend']
+        assert self.login().status_code == status.HTTP_401_UNAUTHORIZED
+        
+        settings.AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.AllowAllUsersModelBackend']
+        response = self.login()
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(response.data['user']['groups']) == ['Moderators', 'Readers, Writers']
+
+
+@pytest.mark.django_db
+class TestUserListFilters:
+    """Test cursor pagination and filters of the admin user list"""
+    
+    def setup_method(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        
+        self.client = APIClient()
+        self.users_url = reverse('user-list')
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com', first_name='Admin', last_name='User', password='password123',
+            is_active=True, is_staff=True
+        )
+        self.moderators, _ = Group.objects.get_or_create(name='Moderators')
+        self.users = []
+        for i in range(12):
+            user = User.objects.create_user(
+                email=f'user{i}@example.com', first_name='User', last_name=f'Number{i}', password='password123',
+                is_active=i % 2 == 0
+            )
+            if i % 3 == 0:
+                user.groups.add(self.moderators)
+            self.users.append(user)
+        # Same date_joined on several rows: the id tie-breaker must keep pages stable
+        start = timezone.now() - timedelta(days=30)
+        for i, user in enumerate(self.users):
+            User.objects.filter(pk=user.pk).update(date_joined=start + timedelta(days=min(i, 6)))
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def ids(self, **params):
+        response = self.client.get(self.users_url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [user['id'] for user in response.data['results']]
+    
+    def test_walk_all_pages(self):
+        expected = list(User.objects.order_by('-date_joined', '-id').values_list('id', flat=True))
+        ids, url = [], self.users_url + '?page_size=5'
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            ids += [user['id'] for user in response.data['results']]
+            url = response.data['next']
+        
+        assert ids == expected
+    
+    def test_filters(self):
+        assert self.ids(is_active='false') == [u.id for u in reversed(self.users) if not u.is_active]
+        assert set(self.ids(is_staff='true')) == {self.admin_user.id}
+        
+        moderators = {u.id for u in self.users[::3]}
+        assert set(self.ids(group='Moderators')) == moderators
+        assert set(self.ids(group=self.moderators.id)) == moderators
+        assert set(self.ids(group='Moderators', is_active='true')) == {u.id for u in self.users[::6]}
+    
+    def test_empty_result_is_an_empty_page(self):
+        response = self.client.get(self.users_url, {'group': 'Nobody'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == []
+        assert response.data['next'] is None
+    
+    def test_cursor_with_bad_datetime(self):
+        from weeb_api.pagination import KeysetPagination
+        
+        token = KeysetPagination().encode_cursor(['not-a-date', 1])
+        
+        assert self.client.get(self.users_url, {'cursor': token}).status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_invalid_values(self):
+        response = self.client.get(self.users_url, {'is_active': 'maybe', 'is_staff': 'yes'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.data) == {'is_active', 'is_staff'}
+    
+    def test_non_admin_refused(self):
+        self.client.force_authenticate(user=self.users[0])
+        
+        assert self.client.get(self.users_url).status_code == status.HTTP_403_FORBIDDEN
+    
+    @pytest.mark.parametrize('params', [{}, {'is_active': 'true'}, {'is_active': 'false'}])
+    def test_pages_use_index_scans(self, params):
+        """
+        EXPLAIN QUERY PLAN of the users query the list endpoint actually runs:
+        pages come off an index, never from a sort. (SQLite does not match the bare
+        boolean condition Django writes to user_active_joined_idx; PostgreSQL does.)
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.users_url, params)
+        sql = next(q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'FROM "users"' in q['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            plan = ' | '.join(row[-1] for row in cursor.fetchall())
+        
+        assert 'user_joined_id_idx' in plan
+        assert 'TEMP B-TREE' not in plan
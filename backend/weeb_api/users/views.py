@@ -2,12 +2,15 @@ from rest_framework import viewsets, status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.http import Http404
 
+from weeb_api.pagination import KeysetPagination
+
+from .blacklist import FilteredRefreshToken
+from .filters import UserFilterBackend
 from .models import User
-from .serializers import UserSerializer, RegisterSerializer, CustomTokenObtainPairSerializer
+from .serializers import UserSerializer, RegisterSerializer, CustomTokenObtainPairSerializer, CustomTokenRefreshSerializer
 
 
 class RegisterView(generics.CreateAPIView):
@@ -46,6 +49,15 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
+class CustomTokenRefreshView(TokenRefreshView):
+    """
+    POST /api/auth/token/refresh/
+    Rotate the refresh token (the old one is blacklisted)
+    Blacklist checks go through the in-memory filter (users.blacklist)
+    """
+    serializer_class = CustomTokenRefreshSerializer
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout_view(request):
@@ -61,7 +73,7 @@ def logout_view(request):
                 'message': 'Refresh token is required.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        token = RefreshToken(refresh_token)
+        token = FilteredRefreshToken(refresh_token)
         token.blacklist()
         
         return Response({
@@ -81,6 +93,8 @@ def me_view(request):
     """
     GET /api/auth/me/
     Get current user info + roles
+    With JWT_CLAIMS_AUTHENTICATION, served from the token's claims and the shared role cache
+    (USER_ROLES_CACHE), without a database query
     """
     user = request.user
     serializer = UserSerializer(user)
@@ -91,33 +105,32 @@ def me_view(request):
     }, status=status.HTTP_200_OK)
 
 
+class UserPagination(KeysetPagination):
+    ordering = ('-date_joined', '-id')
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """
     ViewSet to handle Users (Admin only)
-    GET /api/users/ --> list()
+    GET /api/users/ --> list() [cursor pages, ?is_active=, ?is_staff=, ?group=<id|name>]
     GET /api/users/{id}/ --> retrieve()
     POST /api/users/ --> create()
     PUT /api/users/{id}/ --> update()
     PATCH /api/users/{id}/ --> partial_update()
     DELETE /api/users/{id}/ --> destroy()
     """
-    queryset = User.objects.all()
+    queryset = User.objects.all().prefetch_related('groups')
     serializer_class = UserSerializer
     permission_classes = [IsAdminUser]
+    pagination_class = UserPagination
+    filter_backends = [UserFilterBackend]
     
     def list(self, request, *args, **kwargs):
-        serializer = self.serializer_class(self.queryset, many=True)
-        
-        if not self.queryset.exists():
-            return Response({
-                'success': False,
-                'results': 'No users found.'
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        return Response({
-            'success': True,
-            'results': serializer.data
-        }, status=status.HTTP_200_OK)
+        """GET /api/users/ - List users, newest first, one cursor page at a time"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.serializer_class(page, many=True)
+        return self.paginator.get_paginated_response(serializer.data)
     
     def retrieve(self, request, *args, **kwargs):
         try:
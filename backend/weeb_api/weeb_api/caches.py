@@ -0,0 +1,22 @@
+"""
+Which CACHES aliases can back cross-request state.
+
+Caches holding security-relevant data (user roles, the refresh-token
+blacklist filter) are only correct when an invalidation made by one worker
+is seen by all of them. A locmem cache lives in one process (gunicorn runs
+several) and the dummy cache stores nothing, so neither qualifies.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def shared_cache(alias):
+    """The cache behind ``alias`` when every worker process sees it, else None."""
+    if not alias or alias not in settings.CACHES:
+        return None
+    cache = caches[alias]
+    if isinstance(cache, (LocMemCache, DummyCache)):
+        return None
+    return cache
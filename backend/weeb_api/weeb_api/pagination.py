@@ -0,0 +1,148 @@
+"""
+Keyset (cursor) pagination shared by the API list endpoints.
+
+Unlike page-number pagination, each page is fetched with a range condition on
+an indexed, unique ordering key — e.g. ``(created_at, id) < (last_created_at,
+last_id)`` — so page N costs the same as page 1 and no COUNT(*) is needed.
+The cursor is an opaque urlsafe-base64 token of the last row's key.
+
+Responses keep the API envelope: ``{success, results}`` plus ``next`` (and
+``count`` when asked for with ``?count=exact`` or ``?count=approximate``).
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Subclasses set ``ordering``: a field name followed by the primary key as
+    tie-breaker, both descending, e.g. ``('-created_at', '-id')``.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, position):
+        raw = json.dumps(position, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, queryset, token):
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            value, pk = json.loads(raw)
+            field = queryset.model._meta.get_field(self.ordering[0].lstrip('-'))
+            value, pk = field.to_python(value), int(pk)
+        except (binascii.Error, ValueError, TypeError, OverflowError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None or not -2 ** 63 <= pk < 2 ** 63:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        field_name = self.ordering[0].lstrip('-')
+        pk_name = self.ordering[1].lstrip('-')
+        field = queryset.model._meta.get_field(field_name)
+
+        self.count = self.get_count(queryset, request.query_params.get(self.count_query_param))
+
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            value, pk = self.decode_cursor(queryset, token)
+            queryset = queryset.filter(
+                Q(**{f'{field_name}__lt': value}) | Q(**{field_name: value, f'{pk_name}__lt': pk})
+            )
+
+        rows = list(queryset.order_by(*self.ordering)[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+
+        self.next_position = None
+        if self.has_next:
+            last = rows[-1]
+            if isinstance(last, dict):  # .values() rows (weeb_api.fastpath)
+                value = last[field_name]
+                self.next_position = [value.isoformat() if hasattr(value, 'isoformat') else value, last[pk_name]]
+            else:
+                self.next_position = [field.value_to_string(last), getattr(last, pk_name)]
+        return rows
+
+    def get_count(self, queryset, mode):
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'approximate':
+            # Planner statistics: free, but only meaningful for an unfiltered table
+            if connection.vendor == 'postgresql' and not queryset.query.where:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                                   [queryset.model._meta.db_table])
+                    row = cursor.fetchone()
+                if row and row[0] >= 0:
+                    return row[0]
+            return queryset.count()
+        return None
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        payload = {'success': True}
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'success': {'type': 'boolean'},
+                'count': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class PageNumberEnvelopePagination(PageNumberPagination):
+    """
+    Page-number pagination in the API envelope, for orderings with no usable
+    keyset (e.g. search results ranked by relevance).
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+
+    def get_paginated_response(self, data):
+        return Response({
+            'success': True,
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -0,0 +1,42 @@
+"""
+JSON renderer backed by orjson (pinned in requirements.txt; without it, as in a
+bare dev environment, the stock renderer is used).
+
+Output is byte-identical to DRF's compact JSONRenderer for the payloads the
+API produces: same separators, unescaped unicode, U+2028/U+2029 escaped, and
+datetimes/decimals/lazy strings still encoded by DRF's encoder. The one gap is
+float exponents (orjson writes 1e-5, json writes 1e-05), so only use it on
+endpoints without floats. Anything orjson refuses (lone surrogates, oversized
+ints) and indented output go through the stock renderer.
+"""
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    if orjson is not None:
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or not settings.API_FAST_READS
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=JSONEncoder().default, option=self.options)
+        except (orjson.JSONEncodeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same JavaScript-safety escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -187,4 +187,60 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
     
     'JTI_CLAIM': 'jti',
-}
\ No newline at end of file
+}
+
+# Satisfaction model (review app)
+# Pickle from train_model.py, or a .joblib artifact to memory-map its arrays
+REVIEW_MODEL_PATH = os.environ.get('REVIEW_MODEL_PATH', str(BASE_DIR.parent.parent / 'weeb_api_model.pkl'))
+# Versioned registry (manage.py publish_model); takes precedence over REVIEW_MODEL_PATH when present
+REVIEW_MODEL_REGISTRY_DIR = os.environ.get('REVIEW_MODEL_REGISTRY_DIR', str(BASE_DIR.parent.parent / 'models'))
+REVIEW_MODEL_POLL_INTERVAL = float(os.environ.get('REVIEW_MODEL_POLL_INTERVAL', 30))
+REVIEW_PREDICT_MAX_BATCH_SIZE = int(os.environ.get('REVIEW_PREDICT_MAX_BATCH_SIZE', 500))
+# LRU cache of predictions keyed on normalized message text (0 disables it)
+REVIEW_PREDICTION_CACHE_SIZE = int(os.environ.get('REVIEW_PREDICTION_CACHE_SIZE', 10000))
+# 'inline': score in ReviewViewSet.create; 'deferred': queue for `manage.py score_pending_reviews`
+REVIEW_SCORING_MODE = os.environ.get('REVIEW_SCORING_MODE', 'inline')
+
+# Response cache for article/category reads (blog.cache): a CACHES alias shared
+# by every worker (redis, memcached...); unset, or a locmem alias, disables it
+BLOG_RESPONSE_CACHE = os.environ.get('BLOG_RESPONSE_CACHE', '')
+BLOG_RESPONSE_CACHE_TTL = int(os.environ.get('BLOG_RESPONSE_CACHE_TTL', 60))
+
+# Serializer-free read path for the article and review lists (weeb_api.fastpath),
+# rendered with orjson when installed; responses are byte-identical either way
+API_FAST_READS = os.environ.get('API_FAST_READS', '').lower() in ('1', 'true')
+
+# Article view counters (blog.counters): buffered per process, written in batches
+BLOG_VIEW_COUNT_FLUSH_INTERVAL = float(os.environ.get('BLOG_VIEW_COUNT_FLUSH_INTERVAL', 10))
+BLOG_VIEW_COUNT_MAX_PENDING = int(os.environ.get('BLOG_VIEW_COUNT_MAX_PENDING', 1000))
+
+# Articles per POST/PATCH /api/articles/bulk/ request
+BLOG_BULK_MAX_ITEMS = int(os.environ.get('BLOG_BULK_MAX_ITEMS', 500))
+
+# Cross-request cache of users' group names (users.roles): a CACHES alias shared
+# by every worker (redis, memcached, database...); unset, or a locmem alias,
+# resolves roles once per request instead
+USER_ROLES_CACHE = os.environ.get('USER_ROLES_CACHE', '')
+USER_ROLES_CACHE_TTL = int(os.environ.get('USER_ROLES_CACHE_TTL', 300))
+
+# Claims-only JWT authentication (users.authentication) for every API view
+# instead of one User query per request; off, request.user is the User row
+JWT_CLAIMS_AUTHENTICATION = os.environ.get('JWT_CLAIMS_AUTHENTICATION', '').lower() in ('1', 'true')
+# The User row behind a claims user (model_user) is kept across requests only in
+# a CACHES alias shared by every worker; unset, or a locmem alias, reads it
+JWT_CLAIMS_USER_CACHE = os.environ.get('JWT_CLAIMS_USER_CACHE', '')
+JWT_CLAIMS_USER_CACHE_TTL = int(os.environ.get('JWT_CLAIMS_USER_CACHE_TTL', 30))
+if JWT_CLAIMS_AUTHENTICATION:
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] = ('users.authentication.ClaimsJWTAuthentication',)
+
+# Bloom filter of blacklisted refresh tokens (users.blacklist): the common
+# "not blacklisted" check skips the database; other workers' inserts are seen
+# through a generation in BLACKLIST_FILTER_CACHE, a CACHES alias shared by every
+# worker. Unset, or a locmem alias, every check queries the database instead
+BLACKLIST_FILTER_CAPACITY = int(os.environ.get('BLACKLIST_FILTER_CAPACITY', 100000))
+BLACKLIST_FILTER_ERROR_RATE = float(os.environ.get('BLACKLIST_FILTER_ERROR_RATE', 0.001))
+BLACKLIST_FILTER_CACHE = os.environ.get('BLACKLIST_FILTER_CACHE', '')
+BLACKLIST_FILTER_SYNC_INTERVAL = float(os.environ.get('BLACKLIST_FILTER_SYNC_INTERVAL', 30))
+
+# Logins within this many seconds of the stored last_login do not rewrite it
+LOGIN_LAST_LOGIN_RESOLUTION = int(os.environ.get('LOGIN_LAST_LOGIN_RESOLUTION', 60))
@@ -59,6 +59,9 @@ SIMPLE_JWT['SIGNING_KEY'] = SECRET_KEY
 CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
 SECURE_SSL_REDIRECT = True
+# TLS ends at Render's proxy: trust its X-Forwarded-Proto so request.is_secure()
+# holds and absolute URLs (pagination `next`/`previous`) are https
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 SECURE_HSTS_SECONDS = 31536000
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weeb_api.settings.production')
 
 application = get_wsgi_application()
+
+# Load the satisfaction model at import time so that, with gunicorn's
+# preload_app, it lives in the master and is shared by the forked workers.
+from review.ml import load_model  # noqa: E402
+
+load_model()
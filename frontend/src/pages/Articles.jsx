@@ -1,14 +1,25 @@
 import React from 'react';
 import { Link } from 'react-router-dom';
-import { useQuery } from '@tanstack/react-query';
+import { useInfiniteQuery } from '@tanstack/react-query';
 import * as FramerMotion from 'framer-motion';
 import { articlesAPI } from '../services/api';
 
 const Articles = () => {
-  const { data: articles = [], isLoading: loading, error } = useQuery({
+  // Further pages are only fetched when asked for ("Charger plus")
+  const {
+    data,
+    isLoading: loading,
+    error,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ['articles'],
-    queryFn: articlesAPI.getAllArticles,
+    queryFn: ({ pageParam }) => articlesAPI.getArticlesPage(pageParam),
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
   });
+  const articles = data?.pages.flatMap((page) => page.results) ?? [];
 
   const formatDate = (dateString) => {
     return new Date(dateString).toLocaleDateString('fr-FR', {
@@ -18,11 +29,6 @@ const Articles = () => {
     });
   };
 
-  const truncateContent = (content, maxLength = 150) => {
-    if (content.length <= maxLength) return content;
-    return content.substring(0, maxLength) + '...';
-  };
-
   if (loading) {
     return (
       <main className="text-white px-6 py-16">
@@ -95,7 +101,7 @@ const Articles = () => {
                 key={article.id}
                 initial={{ opacity: 0, y: 20 }}
                 animate={{ opacity: 1, y: 0 }}
-                transition={{ delay: index * 0.1 }}
+                transition={{ delay: (index % 20) * 0.1 }}
                 className="bg-gray-800/50 border border-purple-500/20 rounded-xl overflow-hidden hover:border-purple_text/50 transition-all duration-300 group"
               >
                 {/* Article Card */}
@@ -114,7 +120,7 @@ const Articles = () => {
 
                   {/* Content Preview */}
                   <p className="text-gray-300 mb-6 flex-grow line-clamp-3">
-                    {truncateContent(article.content)}
+                    {article.excerpt}
                   </p>
 
                   {/* Author & Date */}
@@ -144,6 +150,19 @@ const Articles = () => {
             ))}
           </div>
 
+          {/* Load More */}
+          {hasNextPage && (
+            <div className="text-center mt-12">
+              <button
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+                className="bg-purple-600 hover:bg-purple-700 disabled:opacity-50 text-white px-6 py-3 rounded-lg transition-colors font-medium"
+              >
+                {isFetchingNextPage ? 'Chargement...' : 'Charger plus'}
+              </button>
+            </div>
+          )}
+
           {/* Footer Stats */}
           <FramerMotion.motion.div
             initial={{ opacity: 0 }}
@@ -152,7 +171,7 @@ const Articles = () => {
             className="text-center mt-16"
           >
             <p className="text-gray-400 text-lg">
-              {articles.length} article{articles.length > 1 ? 's' : ''} publié{articles.length > 1 ? 's' : ''}
+              {articles.length} article{articles.length > 1 ? 's' : ''} affiché{articles.length > 1 ? 's' : ''}
             </p>
           </FramerMotion.motion.div>
         </div>
@@ -161,9 +161,14 @@ export const authAPI = {
 
 // Articles API
 export const articlesAPI = {
-  getAllArticles: async () => {
-    const response = await axiosInstance.get('/articles/');
-    return response.data.results;
+  getArticlesPage: async (cursor) => {
+    // The list is cursor-paginated: one page per call, `nextCursor` is null on the last one
+    const response = await axiosInstance.get('/articles/', { params: cursor ? { cursor } : {} });
+    const { results, next } = response.data;
+    return {
+      results,
+      nextCursor: next ? new URL(next, window.location.origin).searchParams.get('cursor') : null,
+    };
   },
   
   getArticleById: async (id) => {